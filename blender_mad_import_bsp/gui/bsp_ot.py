@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from bpy.types import Operator
 from bpy_extras.io_utils import ImportHelper
 from bpy.props import StringProperty, FloatProperty, BoolProperty 
@@ -27,6 +29,12 @@ class IMPORT_OT_bsp(Operator, ImportHelper):
         default=True,
     ) # type: ignore
 
+    merge_vertices: BoolProperty(
+        name="Merge Vertices",
+        description="Weld vertices with identical position and UV, such as seams between sectors",
+        default=True,
+    ) # type: ignore
+
     cluster_distance: FloatProperty(
         name="Cluster Distance",
         description="Sectors farther apart than this are imported as separate meshes (0 = single mesh)",
@@ -63,19 +71,21 @@ class IMPORT_OT_bsp(Operator, ImportHelper):
             return {'CANCELLED'}
 
         self.import_bsp(context, self.filepath, self.scale, self.center_geometry,
-                        self.cluster_distance, self.distribute_zones, self.distribute_radius,
+                        self.merge_vertices, self.cluster_distance, self.distribute_zones, self.distribute_radius,
                         self.texture_prefix)
         return {'FINISHED'}
 
     def import_bsp(self, context, filepath, scale=0.01, center_geometry=True,
-                   cluster_distance=10000.0, distribute_zones=False, distribute_radius=1000.0,
+                   merge_vertices=True, cluster_distance=10000.0, distribute_zones=False, distribute_radius=1000.0,
                    texture_prefix=""):
         import bpy
+        import functools
         import math
         import random
         import os
+        import numpy as np
 
-        parsed_bsp = parse_bsp_file(filepath)
+        parsed_bsp = parse_bsp_file(filepath, keep_extensions=False)
         sectors = collect_atomic_sectors(parsed_bsp.get("worldChunk", []))
         if not sectors:
             print("No geometry found in BSP")
@@ -88,201 +98,261 @@ class IMPORT_OT_bsp(Operator, ImportHelper):
         bsp_name = os.path.splitext(os.path.basename(filepath))[0]
         bsp_dir = os.path.dirname(filepath)
 
-        # Create Blender materials
-        blender_materials = []
-        for i, mat in enumerate(materials):
-            mat_name = f"{bsp_name}_mat_{i}_{mat_suffix}"
-            bl_mat = bpy.data.materials.new(name=mat_name)
-            bl_mat.use_nodes = True
-
-            # Get the principled BSDF node
-            nodes = bl_mat.node_tree.nodes
-            links = bl_mat.node_tree.links
-            bsdf = nodes.get("Principled BSDF")
-
-            if bsdf:
-                # Set color
-                color = mat.get("color", {})
-                r = color.get("r", 255) / 255.0
-                g = color.get("g", 255) / 255.0
-                b = color.get("b", 255) / 255.0
-                a = color.get("a", 255) / 255.0
-                bsdf.inputs["Base Color"].default_value = (r, g, b, 1.0)
-
-                # Set specular/roughness
-                specular = mat.get("specular", 0.0)
-                bsdf.inputs["Roughness"].default_value = 1.0 - specular
-
-                # Handle alpha
-                if a < 1.0:
-                    bl_mat.blend_method = 'BLEND'
-                    bsdf.inputs["Alpha"].default_value = a
-
-                # Handle texture
-                if mat.get("isTextured") and mat.get("texture"):
-                    tex_name = mat["texture"].get("diffuseTextureName", "")
-                    if tex_name:
-                        # Create image texture node (always, even if file missing)
-                        tex_node = nodes.new(type="ShaderNodeTexImage")
-                        tex_node.location = (-300, 300)
-                        tex_node.label = tex_name
-                        tex_node.interpolation = 'Closest'
-
-                        # Connect to Base Color
-                        links.new(tex_node.outputs["Color"], bsdf.inputs["Base Color"])
-                        links.new(tex_node.outputs["Alpha"], bsdf.inputs["Alpha"])
-
-                        # Load texture file (let Blender handle missing files)
-                        tex_path = os.path.join(bsp_dir, texture_prefix, f"{tex_name}.png")
-                        try:
-                            image = bpy.data.images.load(tex_path, check_existing=True)
-                        except Exception:
-                            # Create placeholder image with filepath set
-                            image = bpy.data.images.new(name=tex_name, width=1, height=1)
-                            image.filepath = tex_path
-                            image.source = 'FILE'
-                        tex_node.image = image
-                        if image.channels == 4:
-                            bl_mat.blend_method = 'BLEND'
-
-            blender_materials.append(bl_mat)
-
-        # Step 1: Merge ALL geometry into single lists
-        all_verts = []  # (x, y, z) raw coordinates
-        all_faces = []  # (v1, v2, v3) indices into all_verts
-        all_face_materials = []  # material index per face
-        all_uvs = []    # (u, v) per vertex
+        tex_dir = os.path.join(bsp_dir, texture_prefix)
+
+        def texture_path(tex_name):
+            return os.path.join(tex_dir, f"{tex_name}.png")
+
+        def prefetch_texture(tex_path):
+            """Read a texture file into the OS cache; returns whether it exists."""
+            try:
+                with open(tex_path, "rb") as f:
+                    while f.read(1 << 20):
+                        pass
+                return True
+            except OSError:
+                return False
+
+        # Pull texture files from disk in the background while the node trees
+        # are built. bpy is not thread-safe, so the workers only read the
+        # files; the image datablocks are still created on this thread.
+        tex_names = {
+            mat["texture"].get("diffuseTextureName", "")
+            for mat in materials
+            if mat.get("isTextured") and mat.get("texture")
+        }
+        tex_names.discard("")
+        # The with block also shuts the pool down if material setup raises;
+        # every texture prefetched is waited on by load_texture anyway
+        with ThreadPoolExecutor(max_workers=8) as prefetch_pool:
+            tex_prefetch = {
+                tex_name: prefetch_pool.submit(prefetch_texture, texture_path(tex_name))
+                for tex_name in tex_names
+            }
+
+            # Cached for this import only; datablocks must not outlive undo/reload
+            @functools.lru_cache(maxsize=None)
+            def load_texture(tex_name):
+                tex_path = texture_path(tex_name)
+                if tex_prefetch[tex_name].result():
+                    try:
+                        return bpy.data.images.load(tex_path, check_existing=True)
+                    except Exception:
+                        pass
+                # Create placeholder image with filepath set
+                image = bpy.data.images.new(name=tex_name, width=1, height=1)
+                image.filepath = tex_path
+                image.source = 'FILE'
+                return image
+
+            # Create Blender materials
+            blender_materials = []
+            for i, mat in enumerate(materials):
+                mat_name = f"{bsp_name}_mat_{i}_{mat_suffix}"
+                bl_mat = bpy.data.materials.new(name=mat_name)
+                bl_mat.use_nodes = True
+
+                # Get the principled BSDF node
+                nodes = bl_mat.node_tree.nodes
+                links = bl_mat.node_tree.links
+                bsdf = nodes.get("Principled BSDF")
+
+                if bsdf:
+                    # Set color
+                    color = mat.get("color", {})
+                    r = color.get("r", 255) / 255.0
+                    g = color.get("g", 255) / 255.0
+                    b = color.get("b", 255) / 255.0
+                    a = color.get("a", 255) / 255.0
+                    bsdf.inputs["Base Color"].default_value = (r, g, b, 1.0)
+
+                    # Set specular/roughness
+                    specular = mat.get("specular", 0.0)
+                    bsdf.inputs["Roughness"].default_value = 1.0 - specular
+
+                    # Handle alpha
+                    if a < 1.0:
+                        bl_mat.blend_method = 'BLEND'
+                        bsdf.inputs["Alpha"].default_value = a
+
+                    # Handle texture
+                    if mat.get("isTextured") and mat.get("texture"):
+                        tex_name = mat["texture"].get("diffuseTextureName", "")
+                        if tex_name:
+                            # Create image texture node (always, even if file missing)
+                            tex_node = nodes.new(type="ShaderNodeTexImage")
+                            tex_node.location = (-300, 300)
+                            tex_node.label = tex_name
+                            tex_node.interpolation = 'Closest'
+
+                            # Connect to Base Color
+                            links.new(tex_node.outputs["Color"], bsdf.inputs["Base Color"])
+                            links.new(tex_node.outputs["Alpha"], bsdf.inputs["Alpha"])
+
+                            # Load texture file (let Blender handle missing files)
+                            image = load_texture(tex_name)
+                            tex_node.image = image
+                            if image.channels == 4:
+                                bl_mat.blend_method = 'BLEND'
+
+                blender_materials.append(bl_mat)
+
+        # Step 1: Merge ALL geometry into single arrays
+        verts_list = []  # (N, 3) float32 raw coordinates per sector
+        uvs_list = []    # (N, 2) float32 UVs per sector, V flipped
+        all_faces = []  # (T, 3) int64 indices into all_verts per sector
+        all_face_materials = []  # (T,) int64 material index per sector
         vertex_offset = 0
 
         for sector in sectors:
             if sector.get("isNativeData"):
                 continue
-            vertices = sector.get("vertices", [])
-            uvs = sector.get("uvs", [])
-            triangles = sector.get("triangles", [])
+            vertices = sector.get("vertices")
+            uvs = sector.get("uvs")
+            triangles = sector.get("triangles")
             mat_base = sector.get("matListWindowBase", 0)
-            if not vertices:
+            if vertices is None or len(vertices) == 0:
                 continue
 
-            for i, v in enumerate(vertices):
-                all_verts.append((v["x"], v["y"], v["z"]))
-                if uvs and i < len(uvs):
-                    all_uvs.append((uvs[i]["u"], 1.0 - uvs[i]["v"]))
-                else:
-                    all_uvs.append((0, 0))
-
-            for tri in triangles:
-                all_faces.append((
-                    tri["vertex1"] + vertex_offset,
-                    tri["vertex2"] + vertex_offset,
-                    tri["vertex3"] + vertex_offset,
-                ))
+            n = len(vertices)
+            verts_list.append(vertices.astype(np.float32, copy=False))
+
+            # Vertices without a UV get (0, 0)
+            sector_uvs = np.zeros((n, 2), dtype=np.float32)
+            n_uvs = min(len(uvs), n) if uvs is not None else 0
+            if n_uvs:
+                sector_uvs[:n_uvs, 0] = uvs[:n_uvs, 0]
+                sector_uvs[:n_uvs, 1] = 1.0 - uvs[:n_uvs, 1]
+            uvs_list.append(sector_uvs)
+
+            if triangles is not None and len(triangles):
+                all_faces.append(triangles[:, :3].astype(np.int64) + vertex_offset)
                 # Calculate actual material index
-                mat_idx = mat_base + tri.get("materialIndex", 0)
-                all_face_materials.append(mat_idx)
-            vertex_offset += len(vertices)
+                all_face_materials.append(triangles[:, 3].astype(np.int64) + mat_base)
+            vertex_offset += n
 
         if not all_faces:
             self.report({'ERROR'}, "No geometry found")
             return {'CANCELLED'}
 
-        # Step 2: Find connected components of faces using union-find on vertices
+        all_verts = np.concatenate(verts_list)
+        all_uvs = np.concatenate(uvs_list)
+
+        faces = np.concatenate(all_faces)
+        face_materials = np.concatenate(all_face_materials)
+
+        # Weld vertices whose position and UV are bit-identical; sectors are
+        # stored independently, so their shared seams are duplicated
+        if merge_vertices:
+            packed = np.ascontiguousarray(np.hstack([all_verts, all_uvs]))
+            keys = packed.view(np.dtype((np.void, packed.itemsize * packed.shape[1]))).ravel()
+            _, first, remap = np.unique(keys, return_index=True, return_inverse=True)
+            faces = remap.ravel()[faces]
+            all_verts = all_verts[first]
+            all_uvs = all_uvs[first]
+
+        # Step 2: Find connected components of faces by labeling vertices
+        # that share a face
         n_verts = len(all_verts)
-        parent = list(range(n_verts))
-
-        def find(x):
-            root = x
-            while parent[root] != root:
-                root = parent[root]
-            # Path compression
-            while parent[x] != root:
-                next_x = parent[x]
-                parent[x] = root
-                x = next_x
-            return root
-
-        def union(x, y):
-            px, py = find(x), find(y)
-            if px != py:
-                parent[px] = py
-
-        # Connect vertices that share a face
-        for face in all_faces:
-            union(face[0], face[1])
-            union(face[1], face[2])
-
-        # Step 3: Group faces by their connected component
-        component_faces = {}  # root -> list of face indices
-        for face_idx, face in enumerate(all_faces):
-            root = find(face[0])
-            if root not in component_faces:
-                component_faces[root] = []
-            component_faces[root].append(face_idx)
-
-        # Step 4: Calculate bounding box for each component
-        components = []
-        for root, face_indices in component_faces.items():
-            # Get all vertices in this component
-            vert_indices = set()
-            for fi in face_indices:
-                vert_indices.update(all_faces[fi])
-
-            xs = [all_verts[vi][0] for vi in vert_indices]
-            ys = [all_verts[vi][1] for vi in vert_indices]
-            zs = [all_verts[vi][2] for vi in vert_indices]
-
-            components.append({
-                "face_indices": face_indices,
-                "vert_indices": vert_indices,
-                "bbox": (min(xs), max(xs), min(ys), max(ys), min(zs), max(zs)),
-            })
+
+        def connected_components(n, a, b):
+            """Label the components of the graph with edges a[i] - b[i]."""
+            labels = np.arange(n)
+            while True:
+                la = labels[a]
+                lb = labels[b]
+                if np.array_equal(la, lb):
+                    return labels
+                # Hook the larger root onto the smaller one
+                np.minimum.at(labels, np.maximum(la, lb), np.minimum(la, lb))
+                # Pointer jumping until every node points at its root
+                while True:
+                    jumped = labels[labels]
+                    if np.array_equal(jumped, labels):
+                        break
+                    labels = jumped
+
+        labels = connected_components(
+            n_verts,
+            np.concatenate([faces[:, 0], faces[:, 1]]),
+            np.concatenate([faces[:, 1], faces[:, 2]]),
+        )
+
+        # Step 3: Assign each face and its vertices a component index
+        _, face_comp = np.unique(labels[faces[:, 0]], return_inverse=True)
+        face_comp = face_comp.ravel()
+        n_comp = int(face_comp.max()) + 1
+        vert_comp = np.full(n_verts, -1, dtype=np.int64)
+        vert_comp[faces.ravel()] = np.repeat(face_comp, 3)
+
+        # Step 4: Calculate bounding box for each component in one pass over
+        # the vertices sorted by component
+        used = np.flatnonzero(vert_comp >= 0)
+        used = used[np.argsort(vert_comp[used], kind="stable")]
+        starts = np.searchsorted(vert_comp[used], np.arange(n_comp))
+        sorted_verts = all_verts[used]
+        mins = np.minimum.reduceat(sorted_verts, starts, axis=0)
+        maxs = np.maximum.reduceat(sorted_verts, starts, axis=0)
+        bboxes = np.hstack([mins, maxs])  # (n_comp, 6): min xyz, max xyz
 
         # Step 5: Cluster components by bounding box distance
-        n_comp = len(components)
-        comp_parent = list(range(n_comp))
-
-        def find_comp(x):
-            root = x
-            while comp_parent[root] != root:
-                root = comp_parent[root]
-            # Path compression
-            while comp_parent[x] != root:
-                next_x = comp_parent[x]
-                comp_parent[x] = root
-                x = next_x
-            return root
-
-        def union_comp(x, y):
-            px, py = find_comp(x), find_comp(y)
-            if px != py:
-                comp_parent[px] = py
-
-        def bbox_distance(b1, b2):
-            def axis_dist(min1, max1, min2, max2):
-                if max1 < min2:
-                    return min2 - max1
-                elif max2 < min1:
-                    return min1 - max2
-                return 0
-            dx = axis_dist(b1[0], b1[1], b2[0], b2[1])
-            dy = axis_dist(b1[2], b1[3], b2[2], b2[3])
-            dz = axis_dist(b1[4], b1[5], b2[4], b2[5])
-            return (dx*dx + dy*dy + dz*dz) ** 0.5
-
-        if cluster_distance > 0:
-            for i in range(n_comp):
-                for j in range(i + 1, n_comp):
-                    dist = bbox_distance(components[i]["bbox"], components[j]["bbox"])
-                    if dist <= cluster_distance:
-                        union_comp(i, j)
+        def close_bbox_pairs(bboxes, max_dist, block_pairs=1 << 20):
+            """Return index arrays (i, j) of boxes at most max_dist apart.
+
+            Boxes are swept in min-x order, so only those whose x ranges come
+            within max_dist of each other get an exact distance test. Candidates
+            are tested in blocks of about block_pairs to bound memory.
+            """
+            n = len(bboxes)
+            by_min_x = np.argsort(bboxes[:, 0], kind="stable")
+            sorted_bboxes = bboxes[by_min_x]
+            # Candidates for sorted box k are k+1 .. stop[k]-1
+            stop = np.searchsorted(
+                sorted_bboxes[:, 0], sorted_bboxes[:, 3] + max_dist, side="right",
+            )
+            counts = stop - np.arange(n) - 1
+            total = np.cumsum(counts)
+            max_dist_sq = max_dist * max_dist
+
+            pairs_i, pairs_j = [], []
+            start = 0
+            while start < n:
+                done = total[start - 1] if start else 0
+                end = max(int(np.searchsorted(total, done + block_pairs, side="right")), start + 1)
+                block_counts = counts[start:end]
+                first = np.repeat(np.arange(start, end), block_counts)
+                second = (first + 1 + np.arange(block_counts.sum())
+                          - np.repeat(np.cumsum(block_counts) - block_counts, block_counts))
+
+                # Per-axis distance is max(0, min1 - max2, min2 - max1); compare
+                # squared lengths so no square root is needed
+                b1 = sorted_bboxes[first]
+                b2 = sorted_bboxes[second]
+                gap = np.maximum(np.maximum(b1[:, :3] - b2[:, 3:], b2[:, :3] - b1[:, 3:]), 0)
+                close = (gap * gap).sum(axis=1) <= max_dist_sq
+                pairs_i.append(by_min_x[first[close]])
+                pairs_j.append(by_min_x[second[close]])
+                start = end
+
+            return np.concatenate(pairs_i), np.concatenate(pairs_j)
+
+        comp_labels = np.arange(n_comp)
+        if cluster_distance > 0 and n_comp > 1:
+            comp_labels = connected_components(n_comp, *close_bbox_pairs(bboxes, cluster_distance))
 
         # Step 6: Group components into final zones
-        zones = {}
-        for i in range(n_comp):
-            root = find_comp(i)
-            if root not in zones:
-                zones[root] = []
-            zones[root].append(components[i])
+        _, zone_of_comp = np.unique(comp_labels, return_inverse=True)
+        zone_of_comp = zone_of_comp.ravel()
+        n_zones = int(zone_of_comp.max()) + 1
+        face_zone = zone_of_comp[face_comp]
+        zone_face_order = np.argsort(face_zone, kind="stable")
+        zone_starts = np.searchsorted(face_zone[zone_face_order], np.arange(n_zones + 1))
+
+        # Zone positions on the distribution circle
+        if distribute_zones and n_zones > 1:
+            angles = np.linspace(0, 2 * np.pi, n_zones, endpoint=False)
+            zone_xs = (np.cos(angles) * distribute_radius).tolist()
+            zone_ys = (np.sin(angles) * distribute_radius).tolist()
 
         # Create parent empty
         world_parent = bpy.data.objects.new(bsp_name, None)
@@ -290,99 +360,81 @@ class IMPORT_OT_bsp(Operator, ImportHelper):
         # Rotate 90 degrees on X axis (convert from Z-up to Y-up coordinate system)
         world_parent.rotation_euler[0] = math.radians(90)
 
-        # Step 7: Create mesh for each zone
-        n_zones = len(zones)
-        for zone_idx, zone_components in enumerate(zones.values()):
-            # Collect all vertex indices and face indices for this zone
-            zone_vert_indices = set()
-            zone_face_indices = []
-            for comp in zone_components:
-                zone_vert_indices.update(comp["vert_indices"])
-                zone_face_indices.extend(comp["face_indices"])
+        # Step 7: Create mesh for each zone. The global -> local vertex lookup
+        # table is shared; each zone only reads the entries it just wrote.
+        vert_lut = np.full(n_verts, -1, dtype=np.int32)
+        # Blender stores coordinates as float32; keep the math there too
+        scale32 = np.float32(scale)
+        half = np.float32(0.5)
+        for zone_idx in range(n_zones):
+            # Collect all face indices and vertex indices for this zone
+            zone_face_indices = zone_face_order[zone_starts[zone_idx]:zone_starts[zone_idx + 1]]
+
+            # Remap vertex indices to new local indices, numbering vertices in
+            # the order the faces first use them so vertex fetches stay sequential
+            zone_loop_verts = faces[zone_face_indices].ravel()
+            unique_verts, first_use = np.unique(zone_loop_verts, return_index=True)
+            zone_old = unique_verts[np.argsort(first_use)]
+            vert_lut[zone_old] = np.arange(len(zone_old), dtype=np.int32)
+            zone_pts = all_verts[zone_old]
 
             # Calculate center offset for this zone
-            center_offset = (0, 0, 0)
+            center_offset = np.zeros(3, dtype=np.float32)
             if center_geometry:
-                xs = [all_verts[vi][0] for vi in zone_vert_indices]
-                ys = [all_verts[vi][1] for vi in zone_vert_indices]
-                zs = [all_verts[vi][2] for vi in zone_vert_indices]
-                center_offset = (
-                    (min(xs) + max(xs)) / 2,
-                    (min(ys) + max(ys)) / 2,
-                    (min(zs) + max(zs)) / 2,
-                )
-
-            # Remap vertex indices to new local indices
-            old_to_new = {}
-            zone_verts = []
-            zone_uvs = []
-            for old_idx in sorted(zone_vert_indices):
-                old_to_new[old_idx] = len(zone_verts)
-                v = all_verts[old_idx]
-                zone_verts.append((
-                    (v[0] - center_offset[0]) * scale,
-                    (v[1] - center_offset[1]) * scale,
-                    (v[2] - center_offset[2]) * scale,
-                ))
-                zone_uvs.append(all_uvs[old_idx])
+                center_offset = half * (zone_pts.min(axis=0) + zone_pts.max(axis=0))
+
+            zone_verts = (zone_pts - center_offset) * scale32
+            zone_uvs = all_uvs[zone_old]
 
             # Remap faces and collect material indices
-            zone_faces = []
-            zone_face_mats = []
-            for fi in zone_face_indices:
-                face = all_faces[fi]
-                zone_faces.append((
-                    old_to_new[face[0]],
-                    old_to_new[face[1]],
-                    old_to_new[face[2]],
-                ))
-                zone_face_mats.append(all_face_materials[fi])
+            zone_faces = vert_lut[zone_loop_verts].reshape(-1, 3)
+            zone_face_mats = face_materials[zone_face_indices]
 
             # Create mesh
             mesh = bpy.data.meshes.new(f"Zone_{zone_idx}_Mesh")
             obj = bpy.data.objects.new(f"Zone_{zone_idx}", mesh)
             context.collection.objects.link(obj)
 
-            mesh.from_pydata(zone_verts, [], zone_faces)
-            mesh.update()
+            # Fill the mesh buffers directly instead of going through from_pydata
+            n_zone_faces = len(zone_faces)
+            mesh.vertices.add(len(zone_verts))
+            mesh.vertices.foreach_set("co", zone_verts.ravel())
+            mesh.loops.add(n_zone_faces * 3)
+            mesh.loops.foreach_set("vertex_index", zone_faces.ravel())
+            mesh.polygons.add(n_zone_faces)
+            mesh.polygons.foreach_set("loop_start", np.arange(0, n_zone_faces * 3, 3, dtype=np.int32))
+            # loop_total is read-only from 3.6 on, where polygon sizes come from loop_start
+            if bpy.app.version < (3, 6, 0):
+                mesh.polygons.foreach_set("loop_total", np.full(n_zone_faces, 3, dtype=np.int32))
+            mesh.update(calc_edges=True)
 
             # Add materials to mesh and assign to faces
             # First, find which materials are used in this zone
-            used_mats = sorted(set(zone_face_mats))
-            mat_to_slot = {}  # maps global mat index -> slot index in this mesh
+            used_mats = np.unique(zone_face_mats)
+            # maps global mat index -> slot index in this mesh; unknown materials stay on slot 0
+            mat_to_slot = np.zeros(used_mats[-1] + 1, dtype=np.int32)
 
-            for mat_idx in used_mats:
+            for mat_idx in used_mats.tolist():
                 if mat_idx < len(blender_materials):
-                    slot_idx = len(obj.data.materials)
+                    mat_to_slot[mat_idx] = len(obj.data.materials)
                     obj.data.materials.append(blender_materials[mat_idx])
-                    mat_to_slot[mat_idx] = slot_idx
 
             # Assign materials to faces
-            for face_idx, mat_idx in enumerate(zone_face_mats):
-                if mat_idx in mat_to_slot:
-                    mesh.polygons[face_idx].material_index = mat_to_slot[mat_idx]
+            mesh.polygons.foreach_set("material_index", mat_to_slot[zone_face_mats])
 
-            # Apply UVs
-            if zone_uvs:
+            # Apply UVs, one per loop (3 loops per triangle, in face order)
+            if len(zone_uvs):
                 uv_layer = mesh.uv_layers.new(name="UVMap")
-                for face_idx, face in enumerate(zone_faces):
-                    for loop_idx, vert_idx in enumerate(face):
-                        if vert_idx < len(zone_uvs):
-                            uv_layer.data[face_idx * 3 + loop_idx].uv = zone_uvs[vert_idx]
+                uv_layer.data.foreach_set("uv", zone_uvs[zone_faces.ravel()].ravel())
 
             obj.parent = world_parent
 
             # Position zone on circle if distribution is enabled
             if distribute_zones and n_zones > 1:
-                angle = (2 * math.pi * zone_idx) / n_zones
-                obj.location = (
-                    math.cos(angle) * distribute_radius,
-                    math.sin(angle) * distribute_radius,
-                    0,
-                )
+                obj.location = (zone_xs[zone_idx], zone_ys[zone_idx], 0)
 
         world_parent.select_set(True)
         context.view_layer.objects.active = world_parent
 
-        self.report({'INFO'}, f"Imported {len(zones)} zone(s) from {len(components)} connected components")
+        self.report({'INFO'}, f"Imported {n_zones} zone(s) from {n_comp} connected components")
         return {'FINISHED'}
@@ -1,93 +1,165 @@
 #!/usr/bin/env python3
 
+import mmap
 import struct
 from typing import Any, Dict, Optional
-import random
+import zlib
+
+import numpy as np
+
+# Fixed-size structs, compiled once
+SECTION_HEADER = struct.Struct("<Iii")
+TEXTURE_STRUCT = struct.Struct("<BBH")
+MATERIAL_STRUCT = struct.Struct("<i4Biifff")
+ATOMIC_STRUCT = struct.Struct("<iii3f3fii")
+PLANE_STRUCT = struct.Struct("<ifiiff")
+WORLD_STRUCT_HEAD = struct.Struct("<i3f")
+WORLD_STRUCT_40 = struct.Struct("<6I3f3f")
+WORLD_STRUCT_34 = struct.Struct("<3f6I")
+
+# Element type and row width of the AtomicSector geometry blocks
+VERTEX_LAYOUT = (np.dtype("<f4"), 3)    # x, y, z
+COLOR_LAYOUT = (np.dtype("u1"), 4)      # r, g, b, a
+UV_LAYOUT = (np.dtype("<f4"), 2)        # u, v
+TRIANGLE_LAYOUT = (np.dtype("<u2"), 4)  # vertex1, vertex2, vertex3, materialIndex
+GEOMETRY_LAYOUTS = {
+    "vertices": VERTEX_LAYOUT,
+    "colors": COLOR_LAYOUT,
+    "uvs": UV_LAYOUT,
+    "triangles": TRIANGLE_LAYOUT,
+}
+
+class ExtensionData:
+    """Extension block left in the source buffer, hex-encoded on demand."""
+
+    __slots__ = ("data", "offset", "length")
+
+    def __init__(self, data: bytes, offset: int, length: int):
+        self.data = data
+        self.offset = offset
+        self.length = length
+
+    @property
+    def hex(self) -> str:
+        return memoryview(self.data)[self.offset : self.offset + self.length].hex()
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __str__(self) -> str:
+        return self.hex
+
+    def __repr__(self) -> str:
+        return f"ExtensionData(offset=0x{self.offset:X}, length={self.length})"
+
 
 class BinaryReader:
     """Helper class to read binary data with offset tracking."""
 
-    def __init__(self, data: bytes):
+    _u8 = struct.Struct("<B")
+    _i8 = struct.Struct("<b")
+    _u16 = struct.Struct("<H")
+    _i16 = struct.Struct("<h")
+    _u32 = struct.Struct("<I")
+    _i32 = struct.Struct("<i")
+    _u64 = struct.Struct("<Q")
+    _i64 = struct.Struct("<q")
+    _f32 = struct.Struct("<f")
+    _f64 = struct.Struct("<d")
+    _color32 = struct.Struct("<4B")
+
+    def __init__(self, data: bytes, keep_extensions: bool = True):
         self.data = data
+        # When False, extension blocks are skipped and read as None
+        self.keep_extensions = keep_extensions
+        # Slicing the view doesn't copy, unlike slicing bytes
+        self.view = memoryview(data)
         self.offset = 0
 
     def read_uint8(self) -> int:
-        val = struct.unpack_from("<B", self.data, self.offset)[0]
+        val = BinaryReader._u8.unpack_from(self.data, self.offset)[0]
         self.offset += 1
         return val
 
     def read_int8(self) -> int:
-        val = struct.unpack_from("<b", self.data, self.offset)[0]
+        val = BinaryReader._i8.unpack_from(self.data, self.offset)[0]
         self.offset += 1
         return val
 
     def read_uint16(self) -> int:
-        val = struct.unpack_from("<H", self.data, self.offset)[0]
+        val = BinaryReader._u16.unpack_from(self.data, self.offset)[0]
         self.offset += 2
         return val
 
     def read_int16(self) -> int:
-        val = struct.unpack_from("<h", self.data, self.offset)[0]
+        val = BinaryReader._i16.unpack_from(self.data, self.offset)[0]
         self.offset += 2
         return val
 
     def read_uint32(self) -> int:
-        val = struct.unpack_from("<I", self.data, self.offset)[0]
+        val = BinaryReader._u32.unpack_from(self.data, self.offset)[0]
         self.offset += 4
         return val
 
     def read_int32(self) -> int:
-        val = struct.unpack_from("<i", self.data, self.offset)[0]
+        val = BinaryReader._i32.unpack_from(self.data, self.offset)[0]
         self.offset += 4
         return val
 
     def read_uint64(self) -> int:
-        val = struct.unpack_from("<Q", self.data, self.offset)[0]
+        val = BinaryReader._u64.unpack_from(self.data, self.offset)[0]
         self.offset += 8
         return val
 
     def read_int64(self) -> int:
-        val = struct.unpack_from("<q", self.data, self.offset)[0]
+        val = BinaryReader._i64.unpack_from(self.data, self.offset)[0]
         self.offset += 8
         return val
 
     def read_float32(self) -> float:
-        val = struct.unpack_from("<f", self.data, self.offset)[0]
+        val = BinaryReader._f32.unpack_from(self.data, self.offset)[0]
         self.offset += 4
         return val
 
     def read_float64(self) -> float:
-        val = struct.unpack_from("<d", self.data, self.offset)[0]
+        val = BinaryReader._f64.unpack_from(self.data, self.offset)[0]
         self.offset += 8
         return val
 
     def read_color32(self) -> Dict[str, int]:
-        r = self.read_uint8()
-        g = self.read_uint8()
-        b = self.read_uint8()
-        a = self.read_uint8()
+        r, g, b, a = BinaryReader._color32.unpack_from(self.data, self.offset)
+        self.offset += 4
         return {"r": r, "g": g, "b": b, "a": a}
 
-    def read_bytes(self, count: int) -> bytes:
-        val = self.data[self.offset : self.offset + count]
+    def read_bytes(self, count: int) -> memoryview:
+        val = self.view[self.offset : self.offset + count]
         self.offset += count
         return val
 
+    def read_struct(self, fmt: struct.Struct) -> tuple:
+        val = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return val
+
+    def read_extension(self, size: int) -> Optional[ExtensionData]:
+        val = ExtensionData(self.data, self.offset, size) if self.keep_extensions else None
+        self.offset += size
+        return val
+
     def read_string(self, size: int) -> str:
-        raw = self.read_bytes(size)
-        null_idx = raw.find(b"\x00")
+        start = self.offset
+        end = min(start + size, len(self.data))
+        null_idx = self.data.find(b"\x00", start, end)
         if null_idx >= 0:
-            raw = raw[:null_idx]
-        return raw.decode("ascii", errors="replace")
+            end = null_idx
+        self.offset += size
+        return str(self.view[start:end], "ascii", errors="replace")
 
 
 def parse_section_header(reader: BinaryReader) -> Dict[str, int]:
     """Parse a standard RW section header."""
-    return {
-        "identifier": reader.read_uint32(),
-        "size": reader.read_int32(),
-        "version": reader.read_int32(),
-    }
+    identifier, size, version = reader.read_struct(SECTION_HEADER)
+    return {"identifier": identifier, "size": size, "version": version}
 
 
 def parse_texture(reader: BinaryReader) -> Dict[str, Any]:
@@ -103,9 +175,11 @@ def parse_texture(reader: BinaryReader) -> Dict[str, Any]:
     texture["structHeader"] = struct_header
 
     # TextureStruct Data
-    texture["filterMode"] = reader.read_uint8()
-    texture["addressModes"] = reader.read_uint8()
-    texture["useMipLevels"] = reader.read_uint16()
+    (
+        texture["filterMode"],
+        texture["addressModes"],
+        texture["useMipLevels"],
+    ) = reader.read_struct(TEXTURE_STRUCT)
 
     # Diffuse Texture Name (0x0002)
     diffuse_header = parse_section_header(reader)
@@ -120,7 +194,7 @@ def parse_texture(reader: BinaryReader) -> Dict[str, Any]:
     # Texture Extension Header
     tex_ext_header = parse_section_header(reader)
     texture["extensionHeader"] = tex_ext_header
-    texture["extensionData"] = reader.read_bytes(tex_ext_header["size"]).hex()
+    texture["extensionData"] = reader.read_extension(tex_ext_header["size"])
 
     return texture
 
@@ -138,13 +212,17 @@ def parse_material(reader: BinaryReader) -> Dict[str, Any]:
     material["structHeader"] = struct_header
 
     # MaterialStruct Data
-    material["unusedFlags"] = reader.read_int32()
-    material["color"] = reader.read_color32()
-    material["unusedInt2"] = reader.read_int32()
-    material["isTextured"] = reader.read_int32()
-    material["ambient"] = reader.read_float32()
-    material["specular"] = reader.read_float32()
-    material["diffuse"] = reader.read_float32()
+    (
+        unused_flags, r, g, b, a, unused_int2,
+        is_textured, ambient, specular, diffuse,
+    ) = reader.read_struct(MATERIAL_STRUCT)
+    material["unusedFlags"] = unused_flags
+    material["color"] = {"r": r, "g": g, "b": b, "a": a}
+    material["unusedInt2"] = unused_int2
+    material["isTextured"] = is_textured
+    material["ambient"] = ambient
+    material["specular"] = specular
+    material["diffuse"] = diffuse
 
     # Texture (if textured)
     if material["isTextured"] != 0:
@@ -153,7 +231,7 @@ def parse_material(reader: BinaryReader) -> Dict[str, Any]:
     # Material Extension Header
     ext_header = parse_section_header(reader)
     material["extensionHeader"] = ext_header
-    material["extensionData"] = reader.read_bytes(ext_header["size"]).hex()
+    material["extensionData"] = reader.read_extension(ext_header["size"])
 
     return material
 
@@ -181,10 +259,39 @@ def parse_material_list(reader: BinaryReader) -> Dict[str, Any]:
     return mat_list
 
 
+def decode_geometry_blocks(data, blocks: list) -> None:
+    """
+    Decode the geometry blocks located by parse_atomic_sector.
+
+    Every sector's blocks of one kind are decoded into a single owned array,
+    and each sector gets a view of its rows.
+
+    Args:
+        data: Buffer the sectors were parsed from
+        blocks: (atomic, {key: (offset, count)}) pairs, key in GEOMETRY_LAYOUTS
+    """
+    for key, (dtype, width) in GEOMETRY_LAYOUTS.items():
+        spans = [(atomic, block_spans[key]) for atomic, block_spans in blocks if key in block_spans]
+        if not spans:
+            continue
+        merged = np.concatenate([
+            np.frombuffer(data, dtype=dtype, count=count * width, offset=offset).reshape(count, width)
+            for _, (offset, count) in spans
+        ])
+        splits = np.cumsum([count for _, (_, count) in spans])[:-1]
+        for (atomic, _), rows in zip(spans, np.split(merged, splits)):
+            atomic[key] = rows
+
+
 def parse_atomic_sector(
-    reader: BinaryReader, is_collision: bool = False,
+    reader: BinaryReader, is_collision: bool = False, blocks: Optional[list] = None,
 ) -> Dict[str, Any]:
-    """Parse an AtomicSector section (0x0009)."""
+    """
+    Parse an AtomicSector section (0x0009).
+
+    If blocks is given, the geometry arrays are left as None and their
+    locations are appended to it for decode_geometry_blocks.
+    """
     atomic = {}
 
     # AtomicSector Header (identifier already read by caller)
@@ -198,49 +305,39 @@ def parse_atomic_sector(
     start_struct_position = reader.offset
 
     # AtomicSectorStruct Data
-    atomic["matListWindowBase"] = reader.read_int32()
-    num_triangles = reader.read_int32()
-    num_vertices = reader.read_int32()
+    (
+        mat_list_window_base, num_triangles, num_vertices,
+        max_x, max_y, max_z, min_x, min_y, min_z,
+        coll_sector_present, unused,
+    ) = reader.read_struct(ATOMIC_STRUCT)
+    atomic["matListWindowBase"] = mat_list_window_base
     atomic["numTriangles"] = num_triangles
     atomic["numVertices"] = num_vertices
-    atomic["boxMax"] = {
-        "x": reader.read_float32(),
-        "y": reader.read_float32(),
-        "z": reader.read_float32(),
-    }
-    atomic["boxMin"] = {
-        "x": reader.read_float32(),
-        "y": reader.read_float32(),
-        "z": reader.read_float32(),
-    }
-    atomic["collSectorPresent"] = reader.read_int32()
-    atomic["unused"] = reader.read_int32()
+    atomic["boxMax"] = {"x": max_x, "y": max_y, "z": max_z}
+    atomic["boxMin"] = {"x": min_x, "y": min_y, "z": min_z}
+    atomic["collSectorPresent"] = coll_sector_present
+    atomic["unused"] = unused
 
     # Check for native data (data stored elsewhere, struct only contains header)
-    header_size = 11 * 4  # 11 int32/float32 fields
+    header_size = ATOMIC_STRUCT.size  # 11 int32/float32 fields
     if reader.offset == start_struct_position + struct_size:
         if num_vertices != 0 and num_triangles != 0:
             atomic["isNativeData"] = True
             # Skip to extension
             ext_header = parse_section_header(reader)
             atomic["extensionHeader"] = ext_header
-            atomic["extensionData"] = reader.read_bytes(ext_header["size"]).hex()
+            atomic["extensionData"] = reader.read_extension(ext_header["size"])
             return atomic
 
     atomic["isNativeData"] = False
 
-    # Reset to after header and read vertex data
-    reader.offset = start_struct_position + header_size
+    # Locate the geometry blocks; dict keys are filled in now to keep their order
+    vertex_offset = start_struct_position + header_size
+    spans = {}
 
-    # Vertex Data 
-    atomic["vertices"] = [
-        {
-            "x": reader.read_float32(),
-            "y": reader.read_float32(),
-            "z": reader.read_float32(),
-        }
-        for _ in range(num_vertices)
-    ]
+    # Vertex Data
+    atomic["vertices"] = None
+    spans["vertices"] = (vertex_offset, num_vertices)
 
     if not is_collision:
         # Check for two vertex color arrays
@@ -258,57 +355,45 @@ def parse_atomic_sector(
 
         atomic["twoColorArrays"] = two_vcolor_arrays
 
-        # Skip first color array if there are two
+        # Color Data, skipping the first color array if there are two
+        atomic["colors"] = None
         if two_vcolor_arrays:
-            reader.offset += 4 * num_vertices
-
-        # Color Data
-        atomic["colors"] = [reader.read_color32() for _ in range(num_vertices)]
+            spans["colors"] = (vertex_offset + 16 * num_vertices, num_vertices)
+        else:
+            spans["colors"] = (vertex_offset + 12 * num_vertices, num_vertices)
 
-        # Reset position for UV data
+        # UV Data
+        atomic["uvs"] = None
         if two_vcolor_arrays:
-            reader.offset = start_struct_position + header_size + 20 * num_vertices
+            spans["uvs"] = (vertex_offset + 20 * num_vertices, num_vertices)
         else:
-            reader.offset = start_struct_position + header_size + 16 * num_vertices
+            spans["uvs"] = (vertex_offset + 16 * num_vertices, num_vertices)
+    else:
+        atomic["colors"] = np.empty((0, COLOR_LAYOUT[1]), dtype=COLOR_LAYOUT[0])
+        atomic["uvs"] = np.empty((0, UV_LAYOUT[1]), dtype=UV_LAYOUT[0])
 
-        # UV Data
-        atomic["uvs"] = [
-            {"u": reader.read_float32(), "v": reader.read_float32()}
-            for _ in range(num_vertices)
-        ]
+    # Triangle Data is at the end of the struct - order differs between shadow and heroes format
+    atomic["triangles"] = None
+    spans["triangles"] = (start_struct_position + struct_size - 8 * num_triangles, num_triangles)
+
+    if blocks is None:
+        decode_geometry_blocks(reader.data, [(atomic, spans)])
     else:
-        atomic["colors"] = []
-        atomic["uvs"] = []
-
-    # Triangle data is at the end of the struct
-    reader.offset = start_struct_position + struct_size - 8 * num_triangles
-
-    # Triangle Data - order differs between shadow and heroes format
-    atomic["triangles"] = [
-        {
-            "vertex1": reader.read_uint16(),
-            "vertex2": reader.read_uint16(),
-            "vertex3": reader.read_uint16(),
-            "materialIndex": reader.read_uint16(),
-        }
-        for _ in range(num_triangles)
-    ]
+        blocks.append((atomic, spans))
 
-    # Ensure we're at the end of struct
+    # Skip to the end of struct
     reader.offset = start_struct_position + struct_size
 
     # AtomicSector Extension Header
     ext_header = parse_section_header(reader)
     atomic["extensionHeader"] = ext_header
-    atomic["extensionData"] = reader.read_bytes(ext_header["size"]).hex()
+    atomic["extensionData"] = reader.read_extension(ext_header["size"])
 
     return atomic
 
 
-def parse_plane_sector(
-    reader: BinaryReader, is_collision: bool = False
-) -> Dict[str, Any]:
-    """Parse a PlaneSector section (0x000A) recursively."""
+def parse_plane_node(reader: BinaryReader) -> Dict[str, Any]:
+    """Parse a PlaneSector header and struct, without its children."""
     plane = {}
 
     # PlaneSector Header (identifier already read by caller)
@@ -320,58 +405,56 @@ def parse_plane_sector(
     plane["structHeader"] = struct_header
 
     # PlaneStruct Data
-    plane["type"] = reader.read_int32()
-    plane["value"] = reader.read_float32()
-    left_is_atomic = reader.read_int32()
-    right_is_atomic = reader.read_int32()
+    (
+        plane_type, value, left_is_atomic, right_is_atomic, left_value, right_value,
+    ) = reader.read_struct(PLANE_STRUCT)
+    plane["type"] = plane_type
+    plane["value"] = value
     plane["leftIsAtomic"] = left_is_atomic
     plane["rightIsAtomic"] = right_is_atomic
-    plane["leftValue"] = reader.read_float32()
-    plane["rightValue"] = reader.read_float32()
+    plane["leftValue"] = left_value
+    plane["rightValue"] = right_value
 
-    # Left child
-    left_section_id = reader.read_uint32()
-    if left_is_atomic == 1:
-        if left_section_id != 0x0009:
-            raise ValueError(
-                f"Expected AtomicSector (0x0009) for left child, got 0x{left_section_id:04X}"
-            )
-        plane["leftSection"] = {
-            "type": "AtomicSector",
-            "data": parse_atomic_sector(reader, is_collision),
-        }
-    else:
-        if left_section_id != 0x000A:
-            raise ValueError(
-                f"Expected PlaneSector (0x000A) for left child, got 0x{left_section_id:04X}"
-            )
-        plane["leftSection"] = {
-            "type": "PlaneSector",
-            "data": parse_plane_sector(reader, is_collision),
-        }
+    return plane
 
-    # Right child
-    right_section_id = reader.read_uint32()
-    if right_is_atomic == 1:
-        if right_section_id != 0x0009:
-            raise ValueError(
-                f"Expected AtomicSector (0x0009) for right child, got 0x{right_section_id:04X}"
-            )
-        plane["rightSection"] = {
-            "type": "AtomicSector",
-            "data": parse_atomic_sector(reader, is_collision),
-        }
-    else:
-        if right_section_id != 0x000A:
+
+# PlaneSector child (section id, type) by whether the struct flags it as atomic
+CHILD_SECTIONS = {
+    True: (0x0009, "AtomicSector"),
+    False: (0x000A, "PlaneSector"),
+}
+
+
+def parse_plane_sector(
+    reader: BinaryReader, is_collision: bool = False, blocks: Optional[list] = None
+) -> Dict[str, Any]:
+    """Parse a PlaneSector section (0x000A) and its whole subtree."""
+    root = parse_plane_node(reader)
+
+    # Children are stored depth-first, left before right. Pending child
+    # slots are kept on a stack instead of recursing, so deep trees
+    # don't hit the recursion limit
+    stack = [(root, "right"), (root, "left")]
+    push = stack.append
+    pop = stack.pop
+    read_uint32 = reader.read_uint32
+    while stack:
+        parent, side = pop()
+        section_id = read_uint32()
+        expected_id, kind = CHILD_SECTIONS[parent[f"{side}IsAtomic"] == 1]
+        if section_id != expected_id:
             raise ValueError(
-                f"Expected PlaneSector (0x000A) for right child, got 0x{right_section_id:04X}"
+                f"Expected {kind} (0x{expected_id:04X}) for {side} child, got 0x{section_id:04X}"
             )
-        plane["rightSection"] = {
-            "type": "PlaneSector",
-            "data": parse_plane_sector(reader, is_collision),
-        }
+        if kind == "AtomicSector":
+            data = parse_atomic_sector(reader, is_collision, blocks)
+        else:
+            data = parse_plane_node(reader)
+            push((data, "right"))
+            push((data, "left"))
+        parent[f"{side}Section"] = {"type": kind, "data": data}
 
-    return plane
+    return root
 
 
 def parse_world_chunk(
@@ -379,6 +462,7 @@ def parse_world_chunk(
     num_atomic_sectors: int,
     num_plane_sectors: int,
     is_collision: bool = False,
+    blocks: Optional[list] = None,
 ) -> Optional[Dict[str, Any]]:
     """Parse the first world chunk (AtomicSector or PlaneSector)."""
     section_id = reader.read_uint32()
@@ -388,21 +472,21 @@ def parse_world_chunk(
             raise ValueError(f"Expected AtomicSector (0x0009), got 0x{section_id:04X}")
         return {
             "type": "AtomicSector",
-            "data": parse_atomic_sector(reader, is_collision),
+            "data": parse_atomic_sector(reader, is_collision, blocks),
         }
     elif num_plane_sectors > 0:
         if section_id != 0x000A:
             raise ValueError(f"Expected PlaneSector (0x000A), got 0x{section_id:04X}")
         return {
             "type": "PlaneSector",
-            "data": parse_plane_sector(reader, is_collision),
+            "data": parse_plane_sector(reader, is_collision, blocks),
         }
 
     return None
 
 
 def parse(
-    data: bytes, is_collision: bool = False
+    data: bytes, is_collision: bool = False, keep_extensions: bool = True
 ) -> Dict[str, Any]:
     """
     Parse binary World (0x000B) data.
@@ -411,91 +495,89 @@ def parse(
         data: Binary data to parse
         is_collision: If True, skip color and UV data in AtomicSectors
         use triangle format v1,v2,v3,mat
+        keep_extensions: If False, extensionData and worldExtData are None
 
     Returns:
         Dictionary containing all parsed values
     """
-    reader = BinaryReader(data)
+    reader = BinaryReader(data, keep_extensions)
     result = {}
 
     # World Header (0x000B)
-    result["sectionIdentifier"] = reader.read_uint32()
+    (
+        result["sectionIdentifier"],
+        result["sectionSize"],
+        result["renderWareVersion"],
+    ) = reader.read_struct(SECTION_HEADER)
     if result["sectionIdentifier"] != 0x000B:
         raise ValueError(
             f"Expected World section (0x000B), got 0x{result['sectionIdentifier']:04X}"
         )
-    result["sectionSize"] = reader.read_int32()
-    result["renderWareVersion"] = reader.read_int32()
 
     # WorldStruct Header (0x0001)
-    result["worldStructIdentifier"] = reader.read_uint32()
-    world_struct_size = reader.read_int32()
+    struct_identifier, world_struct_size, struct_version = reader.read_struct(SECTION_HEADER)
+    result["worldStructIdentifier"] = struct_identifier
     result["worldStructSize"] = world_struct_size
-    result["worldStructVersion"] = reader.read_int32()
+    result["worldStructVersion"] = struct_version
 
     # WorldStruct Data (varies based on size)
-    result["rootIsWorldSector"] = reader.read_int32()
-    result["inverseOrigin"] = {
-        "x": reader.read_float32(),
-        "y": reader.read_float32(),
-        "z": reader.read_float32(),
-    }
+    result["rootIsWorldSector"], ox, oy, oz = reader.read_struct(WORLD_STRUCT_HEAD)
+    result["inverseOrigin"] = {"x": ox, "y": oy, "z": oz}
 
     if world_struct_size == 0x40:
-        result["numTriangles"] = reader.read_uint32()
-        result["numVertices"] = reader.read_uint32()
-        result["numPlaneSectors"] = reader.read_uint32()
-        result["numAtomicSectors"] = reader.read_uint32()
-        result["colSectorSize"] = reader.read_uint32()
-        result["worldFlags"] = reader.read_uint32()
-        result["boxMax"] = {
-            "x": reader.read_float32(),
-            "y": reader.read_float32(),
-            "z": reader.read_float32(),
-        }
-        result["boxMin"] = {
-            "x": reader.read_float32(),
-            "y": reader.read_float32(),
-            "z": reader.read_float32(),
-        }
+        (
+            result["numTriangles"],
+            result["numVertices"],
+            result["numPlaneSectors"],
+            result["numAtomicSectors"],
+            result["colSectorSize"],
+            result["worldFlags"],
+            max_x, max_y, max_z,
+            min_x, min_y, min_z,
+        ) = reader.read_struct(WORLD_STRUCT_40)
+        result["boxMax"] = {"x": max_x, "y": max_y, "z": max_z}
+        result["boxMin"] = {"x": min_x, "y": min_y, "z": min_z}
     elif world_struct_size == 0x34:
-        result["boxMax"] = {
-            "x": reader.read_float32(),
-            "y": reader.read_float32(),
-            "z": reader.read_float32(),
-        }
-        result["numTriangles"] = reader.read_uint32()
-        result["numVertices"] = reader.read_uint32()
-        result["numPlaneSectors"] = reader.read_uint32()
-        result["numAtomicSectors"] = reader.read_uint32()
-        result["colSectorSize"] = reader.read_uint32()
-        result["worldFlags"] = reader.read_uint32()
+        (
+            max_x, max_y, max_z,
+            result["numTriangles"],
+            result["numVertices"],
+            result["numPlaneSectors"],
+            result["numAtomicSectors"],
+            result["colSectorSize"],
+            result["worldFlags"],
+        ) = reader.read_struct(WORLD_STRUCT_34)
+        result["boxMax"] = {"x": max_x, "y": max_y, "z": max_z}
     else:
         raise ValueError(f"Unknown worldStructSize: 0x{world_struct_size:X}")
 
     # MaterialList
     result["materialList"] = parse_material_list(reader)
 
-    # First World Chunk (AtomicSector or PlaneSector tree)
+    # First World Chunk (AtomicSector or PlaneSector tree); sector geometry
+    # is decoded afterwards in one batch per block kind
+    blocks = []
     result["worldChunk"] = parse_world_chunk(
         reader,
         result["numAtomicSectors"],
         result["numPlaneSectors"],
         is_collision,
+        blocks,
     )
+    decode_geometry_blocks(reader.data, blocks)
 
     # World Extension Header (0x0003)
     result["worldExtIdentifier"] = reader.read_uint32()
     world_ext_size = reader.read_int32()
     result["worldExtSize"] = world_ext_size
     result["worldExtVersion"] = reader.read_int32()
-    result["worldExtData"] = reader.read_bytes(world_ext_size).hex()
+    result["worldExtData"] = reader.read_extension(world_ext_size)
 
     return result
 
 
 def parse_file(
-    filepath: str, is_collision: bool = False
+    filepath: str, is_collision: bool = False, keep_extensions: bool = True
 ) -> Dict[str, Any]:
     """
     Parse a binary file.
@@ -503,27 +585,35 @@ def parse_file(
     Args:
         filepath: Path to the binary file
         is_collision: If True, skip color and UV data in AtomicSectors
+        keep_extensions: If False, extensionData and worldExtData are None
 
     Returns:
         Dictionary containing all parsed values
     """
     with open(filepath, "rb") as f:
-        data = f.read()
-    return parse(data, is_collision)
+        if f.seek(0, 2) == 0:
+            data = b""
+        else:
+            # Not closed explicitly: ExtensionData keeps referencing the map,
+            # which is released once the parse result is dropped
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return parse(data, is_collision, keep_extensions)
 
 
 def collect_atomic_sectors(chunk: Optional[Dict[str, Any]]) -> list:
-    """Recursively collect all AtomicSector data from the BSP tree."""
-    if chunk is None:
-        return []
-
+    """Collect all AtomicSector data from the BSP tree, in file order."""
     sectors = []
-    if chunk["type"] == "AtomicSector":
-        sectors.append(chunk["data"])
-    elif chunk["type"] == "PlaneSector":
-        plane_data = chunk["data"]
-        sectors.extend(collect_atomic_sectors(plane_data.get("leftSection")))
-        sectors.extend(collect_atomic_sectors(plane_data.get("rightSection")))
+    stack = [chunk]
+    while stack:
+        chunk = stack.pop()
+        if chunk is None:
+            continue
+        if chunk["type"] == "AtomicSector":
+            sectors.append(chunk["data"])
+        elif chunk["type"] == "PlaneSector":
+            plane_data = chunk["data"]
+            stack.append(plane_data.get("rightSection"))
+            stack.append(plane_data.get("leftSection"))
 
     return sectors
 
@@ -566,7 +656,9 @@ def write_obj(output_path: str, filename: str, world_data: dict, texture_prefix:
     """Write parsed world data to OBJ file, optionally scaling geometry."""
     import os
     
-    mat_suffix = str(random.randint(1000, 9999))
+    # Derived from the filename, so material names are stable across runs
+    # and differ between OBJs written from different BSPs
+    mat_suffix = f"{zlib.crc32(filename.encode('utf-8')):08x}"
 
     sectors = collect_atomic_sectors(world_data.get("worldChunk", []))
     if not sectors:
@@ -582,7 +674,9 @@ def write_obj(output_path: str, filename: str, world_data: dict, texture_prefix:
     vertex_offset = 0
     uv_offset = 0
 
-    with open(obj_path, "w") as f:
+    # Sector blocks are written in a few large chunks; a 1 MiB buffer keeps
+    # that to a handful of OS writes per sector
+    with open(obj_path, "w", buffering=1 << 20, encoding="utf-8") as f:
         f.write("# RenderWare World BSP Export\n")
         f.write(f"# Vertices: {world_data.get('numVertices', 0)}\n")
         f.write(f"# Triangles: {world_data.get('numTriangles', 0)}\n")
@@ -592,46 +686,58 @@ def write_obj(output_path: str, filename: str, world_data: dict, texture_prefix:
             if sector.get("isNativeData"):
                 continue
 
-            vertices = sector.get("vertices", [])
-            uvs = sector.get("uvs", [])
-            triangles = sector.get("triangles", [])
+            vertices = sector.get("vertices")
+            uvs = sector.get("uvs")
+            triangles = sector.get("triangles")
 
-            if not vertices:
+            if vertices is None or len(vertices) == 0:
                 continue
+            if uvs is None:
+                uvs = np.empty((0, 2), dtype=np.float32)
 
             f.write(f"# Sector {sector_idx}\n")
             f.write(f"g sector_{sector_idx}\n")
 
             # Write vertices with scaling
-            for v in vertices:
-                f.write(f"v {v['x']*scale:.6f} {v['y']*scale:.6f} {v['z']*scale:.6f}\n")
+            f.write("".join(
+                "v %.6f %.6f %.6f\n" % tuple(v)
+                for v in (vertices.astype(np.float64) * scale).tolist()
+            ))
 
             # Write UVs (V flipped)
-            for uv in uvs:
-                f.write(f"vt {uv['u']:.6f} {1.0 - uv['v']:.6f}\n")
-
-            # Group triangles by material (add matListWindowBase to get actual material index)
-            mat_base = sector.get("matListWindowBase", 0)
-            tris_by_mat = {}
-            for tri in triangles:
-                mat_idx = mat_base + tri["materialIndex"]
-                tris_by_mat.setdefault(mat_idx, []).append(tri)
+            f.write("".join(
+                "vt %.6f %.6f\n" % (u, 1.0 - v)
+                for u, v in uvs.astype(np.float64).tolist()
+            ))
+
+            # Group triangles by material (add matListWindowBase to get actual
+            # material index); a stable sort keeps file order within a material
+            if triangles is None or len(triangles) == 0:
+                triangles = np.empty((0, 4), dtype=np.uint16)
+            mats = triangles[:, 3].astype(np.int64) + sector.get("matListWindowBase", 0)
+            order = np.argsort(mats, kind="stable")
+            sorted_mats = mats[order]
+            corners = triangles[order, :3].astype(np.int64)
+            bounds = np.flatnonzero(np.diff(sorted_mats)) + 1
+            starts = np.concatenate(([0], bounds))
+            ends = np.concatenate((bounds, [len(sorted_mats)]))
+
+            # Face lines as (v1, vt1, v2, vt2, v3, vt3) or (v1, v2, v3) rows
+            if len(uvs):
+                face_rows = np.repeat(corners, 2, axis=1)
+                face_rows[:, 0::2] += vertex_offset + 1
+                face_rows[:, 1::2] += uv_offset + 1
+                face_fmt = "f %d/%d %d/%d %d/%d\n"
+            else:
+                face_rows = corners + (vertex_offset + 1)
+                face_fmt = "f %d %d %d\n"
 
             # Write faces grouped by material
-            for mat_idx in sorted(tris_by_mat.keys()):
-                f.write(f"usemtl material_{mat_idx}_{mat_suffix}\n")
-                for tri in tris_by_mat[mat_idx]:
-                    v1 = tri["vertex1"] + vertex_offset + 1
-                    v2 = tri["vertex2"] + vertex_offset + 1
-                    v3 = tri["vertex3"] + vertex_offset + 1
-
-                    if uvs:
-                        vt1 = tri["vertex1"] + uv_offset + 1
-                        vt2 = tri["vertex2"] + uv_offset + 1
-                        vt3 = tri["vertex3"] + uv_offset + 1
-                        f.write(f"f {v1}/{vt1} {v2}/{vt2} {v3}/{vt3}\n")
-                    else:
-                        f.write(f"f {v1} {v2} {v3}\n")
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                if start == end:
+                    continue
+                f.write(f"usemtl material_{sorted_mats[start]}_{mat_suffix}\n")
+                f.write("".join(face_fmt % tuple(row) for row in face_rows[start:end].tolist()))
 
             vertex_offset += len(vertices)
             uv_offset += len(uvs)
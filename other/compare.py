@@ -1,23 +1,29 @@
 import hashlib
+import os
 from pathlib import Path
 import re
 
 IGNORE_SUFFIXES = {".py"}
 NUM_PREFIX_RE = re.compile(r"^\d+_")  # matches leading numbers + underscore
 
-def normalize_filename(path):
+_IGNORE_SUFFIXES_LOWER = frozenset(s.lower() for s in IGNORE_SUFFIXES)
+_strip_num_prefix = NUM_PREFIX_RE.sub
+
+def normalize_filename(filename):
     """
     Returns the filename normalized for comparison:
     - numeric prefix removed
     - lowercase
     """
-    filename = path.name
-    filename = NUM_PREFIX_RE.sub("", filename)
-    return filename.lower()
+    return _strip_num_prefix("", filename).lower()
 
-def file_hash(path, chunk_size=8192):
-    h = hashlib.sha256()
+def file_hash(path, chunk_size=1 << 20):
+    # Only used for equality, so BLAKE2 (faster than SHA-256 without
+    # hardware SHA) is enough; file_digest runs the read loop in C
     with path.open("rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "blake2b").hexdigest()
+        h = hashlib.blake2b()
         while chunk := f.read(chunk_size):
             h.update(chunk)
     return h.hexdigest()
@@ -26,11 +32,20 @@ script_dir = Path(__file__).resolve().parent
 other_dir = Path(r"C:\Users\Max\Desktop\rwBSP_test\banquet")
 
 def collect_files(base):
+    """Map normalized filename -> (path, size in bytes)."""
     files = {}
-    for p in base.rglob("*"):
-        if p.is_file() and p.suffix.lower() not in (s.lower() for s in IGNORE_SUFFIXES):
-            norm_name = normalize_filename(p)
-            files[norm_name] = p
+    # Depth-first in the same order as rglob, so later duplicates still win
+    stack = [str(base)]
+    while stack:
+        subdirs = []
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file() and Path(entry.name).suffix.lower() not in _IGNORE_SUFFIXES_LOWER:
+                    norm_name = normalize_filename(entry.name)
+                    files[norm_name] = (Path(entry.path), entry.stat().st_size)
+        stack.extend(reversed(subdirs))
     return files
 
 files_a = collect_files(script_dir)
@@ -40,8 +55,8 @@ all_names = set(files_a) | set(files_b)
 
 changed_dff_count = 0
 for name in sorted(all_names):
-    a = files_a.get(name)
-    b = files_b.get(name)
+    a, size_a = files_a.get(name, (None, None))
+    b, size_b = files_b.get(name, (None, None))
 
     # filename-wise difference
     if a is None:
@@ -51,8 +66,9 @@ for name in sorted(all_names):
         print(f"FILENAME  | only in script  | {a}")
         continue
 
-    # content-wise difference
-    if file_hash(a) != file_hash(b):
+    # content-wise difference; files of different sizes can't be equal,
+    # so only hash when the sizes match
+    if size_a != size_b or file_hash(a) != file_hash(b):
         print(f"CONTENT   | {a}  !=  {b}")
         if a.suffix.lower() == ".dff":
             changed_dff_count += 1
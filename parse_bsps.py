@@ -3,6 +3,8 @@ import sys
 import json
 import os
 
+import numpy as np
+
 script_dir = os.path.dirname(os.path.abspath(__file__))
 
 OUT_FOLDER = os.path.join(script_dir, "parsed_bsps")
@@ -10,6 +12,12 @@ MAKE_OBJ = True
 TEXTURE_PREFIX = "textures/"
 GEO_SCALE= 1
 
+def json_default(obj):
+    """Serialize the NumPy geometry arrays from a parsed BSP."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return str(obj)
+
 def parseBSP(file_path, output_folder=True, make_obj=False, texture_prefix=""):
     IS_COLLISION = "Col" in file_path
 
@@ -19,13 +27,14 @@ def parseBSP(file_path, output_folder=True, make_obj=False, texture_prefix=""):
         print("Collision mode enabled")
 
     try:
-        result = parse_file(file_path, IS_COLLISION)
+        # Extension data only ends up in the JSON dump
+        result = parse_file(file_path, IS_COLLISION, keep_extensions=not make_obj)
         if make_obj:
             base_name = os.path.splitext(os.path.basename(file_path))[0]
             write_obj(output_folder, base_name, result, texture_prefix, GEO_SCALE)
         else:
             with open(os.path.join(output_folder, "parser.json"), "w") as f:
-                json.dump(result, f, indent=2, default=str)
+                json.dump(result, f, indent=2, default=json_default)
 
     except FileNotFoundError:
         print(f"Error: File not found: {file_path}")
@@ -1,3 +1,4 @@
+import functools
 import struct
 
 
@@ -20,12 +21,16 @@ class Parser:
     # Core helpers
     # -------------------------
 
+    # Compiled Struct per format string, shared by all parsers
+    _struct = staticmethod(functools.lru_cache(maxsize=None)(struct.Struct))
+
     def _read(self, fmt: str):
-        size = struct.calcsize(fmt)
+        st = self._struct(fmt)
+        size = st.size
         if self.offset + size > len(self.data):
             raise EOFError("Attempt to read past end of buffer")
 
-        value = struct.unpack_from(fmt, self.data, self.offset)
+        value = st.unpack_from(self.data, self.offset)
         self.offset += size
         return value[0] if len(value) == 1 else value
 
@@ -91,15 +96,12 @@ class Parser:
         return b
 
     def readCString(self, encoding="utf-8") -> str:
-        start = self.offset
-        while self.offset < len(self.data) and self.data[self.offset] != 0:
-            self.offset += 1
-
-        if self.offset >= len(self.data):
+        end = self.data.find(b"\x00", self.offset)
+        if end < 0:
             raise EOFError("Unterminated C string")
 
-        s = self.data[start : self.offset].decode(encoding)
-        self.offset += 1  # skip null byte
+        s = self.data[self.offset : end].decode(encoding)
+        self.offset = end + 1  # skip null byte
         return s
 
 
@@ -1,24 +1,21 @@
 import struct
 import argparse
+import mmap
+import re
 
 BF = 0xBF
+BF_RUN_RE = re.compile(re.escape(bytes([BF])) + b"*")  # run of BF padding bytes
 
-def read_u32(f):
-    data = f.read(4)
-    if len(data) != 4:
+def read_u32(data, pos):
+    if pos + 4 > len(data):
         raise EOFError("Unexpected EOF while reading u32")
-    return struct.unpack("<I", data)[0]
+    return struct.unpack_from("<I", data, pos)[0], pos + 4
 
-def read_cstring(f):
-    data = bytearray()
-    while True:
-        b = f.read(1)
-        if not b:
-            raise EOFError("EOF while reading cstring")
-        if b == b'\x00':
-            break
-        data.append(b[0])
-    return data.decode("ascii", errors="replace")
+def read_cstring(data, pos):
+    end = data.find(b'\x00', pos)
+    if end < 0:
+        raise EOFError("EOF while reading cstring")
+    return data[pos:end].decode("ascii", errors="replace"), end + 1
 
 def parse_file(path):
     result = {
@@ -27,31 +24,28 @@ def parse_file(path):
     }
 
     with open(path, "rb") as f:
-        num_entries = read_u32(f)
-        result["numEntries"] = num_entries
+        if f.seek(0, 2) == 0:
+            raise EOFError("Unexpected EOF while reading u32")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            num_entries, pos = read_u32(data, 0)
+            result["numEntries"] = num_entries
 
-        for i in range(num_entries):
-            name = read_cstring(f)
+            for i in range(num_entries):
+                name, pos = read_cstring(data, pos)
 
-            bf_count = 0
-            while True:
-                pos = f.tell()
-                b = f.read(1)
-                if not b:
+                end = BF_RUN_RE.match(data, pos).end()
+                if end >= len(data):
                     raise EOFError("EOF while skipping BF bytes")
-                if b[0] == BF:
-                    bf_count += 1
-                else:
-                    f.seek(pos)
-                    break
+                bf_count = end - pos
+                pos = end
 
-            count = read_u32(f)
+                count, pos = read_u32(data, pos)
 
-            result["entries"].append({
-                "name": name,
-                "bf_padding": bf_count,
-                "count": count
-            })
+                result["entries"].append({
+                    "name": name,
+                    "bf_padding": bf_count,
+                    "count": count
+                })
 
     return result
 
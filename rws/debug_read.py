@@ -1,129 +1,230 @@
+import argparse
+import mmap
 import struct
-
-def read_string_size(data, offset):
-    """RWS strings are null-terminated then padded to 0x10"""
-    i = 0
-    while i < 255:
-        if data[offset + i] == 0:
-            return i + (0x10 - (i % 0x10))
-        i += 1
-    return 0
-
-with open('banquetAudioStreamUS.rws', 'rb') as f:
-    data = f.read()
-
-# Parse header
-file_id = struct.unpack_from('<I', data, 0x00)[0]
-file_size = struct.unpack_from('<I', data, 0x04)[0]
-file_version = struct.unpack_from('<I', data, 0x08)[0]
-
-print(f"File ID: {hex(file_id)}")
-print(f"File Size: {file_size}")
-print(f"File Version: {hex(file_version)}")
-
-# Parse header chunk
-header_chunk_id = struct.unpack_from('<I', data, 0x0c)[0]
-header_size = struct.unpack_from('<I', data, 0x10)[0]
-header_version = struct.unpack_from('<I', data, 0x14)[0]
-
-print(f"\nHeader Chunk ID: {hex(header_chunk_id)}")
-print(f"Header Size: {header_size}")
-print(f"Header Version: {hex(header_version)}")
-
-# Parse data chunk
-data_offset = 0x0c + 0x0c + header_size
-data_chunk_id = struct.unpack_from('<I', data, data_offset)[0]
-data_size = struct.unpack_from('<I', data, data_offset + 0x04)[0]
-data_version = struct.unpack_from('<I', data, data_offset + 0x08)[0]
-
-print(f"\nData Chunk offset: {hex(data_offset)}")
-print(f"Data Chunk ID: {hex(data_chunk_id)}")
-print(f"Data Size: {data_size}")
-print(f"Data Version: {hex(data_version)}")
-
-# Header chunk data starts at 0x18
-offset = 0x18
-print(f"\n=== Header Chunk Data ===")
-print(f"Base header offset: {hex(offset)}")
-
-# Base header
-total_segments = struct.unpack_from('<I', data, offset + 0x20)[0]
-total_layers = struct.unpack_from('<I', data, offset + 0x28)[0]
-print(f"Total segments: {total_segments}")
-print(f"Total layers: {total_layers}")
-
-offset += 0x50
-print(f"After base header: {hex(offset)}")
-
-# Audio file name
-file_name_size = read_string_size(data, offset)
-print(f"\nFile name at {hex(offset)}, size: {file_name_size}")
-file_name = data[offset:offset+file_name_size-0x10].rstrip(b'\x00').decode('utf-8', errors='ignore')
-print(f"File name: {file_name}")
-offset += file_name_size
-print(f"After file name: {hex(offset)}")
-
-# Segment info (0x20 bytes per segment)
-print(f"\nSegment info starts at {hex(offset)}")
-seg_info_start = offset
-for i in range(min(3, total_segments)):  # Just show first 3
-    seg_offset = struct.unpack_from('<I', data, offset + 0x1c)[0]
-    seg_layers_size = struct.unpack_from('<I', data, offset + 0x18)[0]
-    print(f"  Segment {i+1}: offset={seg_offset}, layers_size={seg_layers_size}")
-    offset += 0x20
-
-print(f"After all segment info ({total_segments} segments): {hex(offset)}")
-
-# Usable layer sizes
-print(f"\nUsable layer sizes at {hex(offset)}")
-for i in range(min(5, total_segments * total_layers)):
-    usable = struct.unpack_from('<I', data, offset)[0]
-    print(f"  Usable {i+1}: {usable}")
-    offset += 0x04
-
-print(f"After usable sizes ({total_segments * total_layers}): {hex(offset)}")
-
-# Segment UUIDs
-print(f"\nSegment UUIDs at {hex(offset)} ({0x10 * total_segments} bytes)")
-offset += 0x10 * total_segments
-print(f"After segment UUIDs: {hex(offset)}")
-
-# Segment names
-print(f"\nSegment names at {hex(offset)}")
-for i in range(min(3, total_segments)):
-    seg_name_size = read_string_size(data, offset)
-    seg_name = data[offset:offset+seg_name_size-0x10].rstrip(b'\x00').decode('utf-8', errors='ignore')
-    print(f"  Segment {i+1} name: '{seg_name}' (size={seg_name_size})")
-    offset += seg_name_size
-
-print(f"After all segment names: {hex(offset)}")
-
-# Layer info
-print(f"\nLayer info at {hex(offset)}")
-for i in range(total_layers):
-    block_size_pad = struct.unpack_from('<I', data, offset + 0x10)[0]
-    interleave = struct.unpack_from('<H', data, offset + 0x18)[0]
-    frame_size = struct.unpack_from('<H', data, offset + 0x1a)[0]
-    block_size = struct.unpack_from('<I', data, offset + 0x20)[0]
-    layer_start = struct.unpack_from('<I', data, offset + 0x24)[0]
-    print(f"  Layer {i+1}: block_size_pad={block_size_pad}, interleave={interleave}, frame_size={frame_size}, block_size={block_size}, layer_start={layer_start}")
-    offset += 0x28
-
-print(f"After layer info: {hex(offset)}")
-
-# Layer config
-print(f"\nLayer config at {hex(offset)}")
-for i in range(total_layers):
-    sample_rate = struct.unpack_from('<I', data, offset + 0x00)[0]
-    channels = struct.unpack_from('<B', data, offset + 0x0d)[0]
-    codec = struct.unpack_from('<I', data, offset + 0x1c)[0]
-    print(f"  Layer {i+1}: sample_rate={sample_rate}, channels={channels}, codec={hex(codec)}")
-    offset += 0x2c
-    
-    # Check for DSP
-    if codec == 0xF86215B0:
-        offset += 0x60
-    
-    offset += 0x04  # padding
-
-print(f"After layer config: {hex(offset)}")
+import sys
+import uuid
+
+import numpy as np
+
+# Record layouts, compiled once; pad bytes skip the fields that aren't shown
+CHUNK_HEADER = struct.Struct('<III')              # id, size, version
+FILE_HEADERS = struct.Struct('<6I')               # file chunk header + header chunk header
+BASE_HEADER_COUNTS = struct.Struct('<32xI4xI')    # total_segments @0x20, total_layers @0x28
+LAYER_CONFIG = struct.Struct('<I9xB14xI')         # sample_rate @0x00, channels @0x0d, codec @0x1c
+
+# Bytes that follow a layer config for codecs that carry an extra block
+EXTRA_BY_CODEC = {
+    0xF86215B0: 0x60,  # DSP ADPCM
+}
+
+# Fixed-stride tables, decoded whole with np.frombuffer
+SEGMENT_INFO_DTYPE = np.dtype({
+    'names': ['layers_size', 'offset'],
+    'formats': ['<u4', '<u4'],
+    'offsets': [0x18, 0x1c],
+    'itemsize': 0x20,
+})
+USABLE_SIZE_DTYPE = np.dtype('<u4')
+LAYER_INFO_DTYPE = np.dtype({
+    'names': ['block_size_pad', 'interleave', 'frame_size', 'block_size', 'layer_start'],
+    'formats': ['<u4', '<u2', '<u2', '<u4', '<u4'],
+    'offsets': [0x10, 0x18, 0x1a, 0x20, 0x24],
+    'itemsize': 0x28,
+})
+# Layer configs vary in stride by codec, so they're gathered with LAYER_CONFIG
+# into this packed record type rather than viewed in place
+LAYER_CONFIG_DTYPE = np.dtype([('sample_rate', '<u4'), ('channels', 'u1'), ('codec', '<u4')])
+
+class LazyUUIDArray:
+    """(N, 2) uint64 view of packed 16-byte UUIDs; uuid.UUID objects are built on indexing"""
+
+    def __init__(self, words):
+        self.words = words
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getitem__(self, i):
+        return uuid.UUID(bytes=self.words[i].tobytes())
+
+def find_string(data, offset):
+    """(end, size) of the RWS string at offset: end is its NUL, size its padded
+    length. RWS strings are null-terminated then padded to 0x10
+
+    A string with no NUL in 255 bytes reads as empty, with end = offset and size 0
+    """
+    end = data.find(b'\x00', offset, offset + 255)
+    if end < 0:
+        return offset, 0
+    # Next multiple of 0x10 above the length: i + (0x10 - i % 0x10)
+    return end, ((end - offset) | 0xF) + 1
+
+def parse_header(data):
+    """Read the chunk headers and the base header counts, stopping at 0x18 + 0x50
+
+    Only touches the start of the file and the data chunk header
+    """
+    # Parse header and header chunk header, which are adjacent at 0x00 and 0x0c
+    (
+        file_id, file_size, file_version,
+        header_chunk_id, header_size, header_version,
+    ) = FILE_HEADERS.unpack_from(data, 0x00)
+
+    # Parse data chunk
+    data_offset = 0x0c + 0x0c + header_size
+    data_chunk_id, data_size, data_version = CHUNK_HEADER.unpack_from(data, data_offset)
+
+    # Header chunk data starts at 0x18 with the base header
+    total_segments, total_layers = BASE_HEADER_COUNTS.unpack_from(data, 0x18)
+
+    return {
+        'file_id': file_id,
+        'file_size': file_size,
+        'file_version': file_version,
+        'header_chunk_id': header_chunk_id,
+        'header_size': header_size,
+        'header_version': header_version,
+        'data_offset': data_offset,
+        'data_chunk_id': data_chunk_id,
+        'data_size': data_size,
+        'data_version': data_version,
+        'total_segments': total_segments,
+        'total_layers': total_layers,
+    }
+
+def iter_header(header):
+    """Report lines for a parse_header result"""
+    yield f"File ID: {header['file_id']:#x}"
+    yield f"File Size: {header['file_size']}"
+    yield f"File Version: {header['file_version']:#x}"
+
+    yield f"\nHeader Chunk ID: {header['header_chunk_id']:#x}"
+    yield f"Header Size: {header['header_size']}"
+    yield f"Header Version: {header['header_version']:#x}"
+
+    yield f"\nData Chunk offset: {header['data_offset']:#x}"
+    yield f"Data Chunk ID: {header['data_chunk_id']:#x}"
+    yield f"Data Size: {header['data_size']}"
+    yield f"Data Version: {header['data_version']:#x}"
+
+    yield f"\n=== Header Chunk Data ==="
+    yield f"Base header offset: {0x18:#x}"
+    yield f"Total segments: {header['total_segments']}"
+    yield f"Total layers: {header['total_layers']}"
+    yield f"After base header: {0x18 + 0x50:#x}"
+
+def parse_tables(data, view, header):
+    """Walk the header chunk tables after the base header, yielding report lines
+    as each one is read
+
+    Stopping early leaves the rest of the map untouched
+    """
+    total_segments = header['total_segments']
+    total_layers = header['total_layers']
+
+    # The whole header chunk is parsed below; ask for it to be read ahead in one
+    # go rather than faulted in a page at a time (madvise is POSIX-only)
+    if hasattr(mmap, 'MADV_WILLNEED'):
+        data.madvise(mmap.MADV_WILLNEED, 0, min(len(data), header['data_offset'] + 0x0c))
+
+    offset = 0x18 + 0x50
+
+    # Audio file name
+    file_name_end, file_name_size = find_string(data, offset)
+    yield f"\nFile name at {offset:#x}, size: {file_name_size}"
+    file_name = str(view[offset:file_name_end], 'utf-8', 'ignore')
+    yield f"File name: {file_name}"
+    offset += file_name_size
+    yield f"After file name: {offset:#x}"
+
+    # Segment info (0x20 bytes per segment)
+    yield f"\nSegment info starts at {offset:#x}"
+    seg_info_start = offset
+    segments = np.frombuffer(data, SEGMENT_INFO_DTYPE, count=total_segments, offset=offset)
+    for i, (seg_layers_size, seg_offset) in enumerate(segments[:3].tolist()):  # Just show first 3
+        yield f"  Segment {i+1}: offset={seg_offset}, layers_size={seg_layers_size}"
+    offset += segments.nbytes
+
+    yield f"After all segment info ({total_segments} segments): {offset:#x}"
+
+    # Usable layer sizes
+    yield f"\nUsable layer sizes at {offset:#x}"
+    usable_sizes = np.frombuffer(data, USABLE_SIZE_DTYPE, count=total_segments * total_layers, offset=offset)
+    for i, usable in enumerate(usable_sizes[:5].tolist()):
+        yield f"  Usable {i+1}: {usable}"
+    offset += usable_sizes.nbytes
+
+    yield f"After usable sizes ({total_segments * total_layers}): {offset:#x}"
+
+    # Segment UUIDs
+    yield f"\nSegment UUIDs at {offset:#x} ({0x10 * total_segments} bytes)"
+    segment_uuids = LazyUUIDArray(
+        np.frombuffer(data, '<u8', count=2 * total_segments, offset=offset).reshape(-1, 2)
+    )
+    offset += segment_uuids.words.nbytes
+    yield f"After segment UUIDs: {offset:#x}"
+
+    # Segment names
+    yield f"\nSegment names at {offset:#x}"
+    for i in range(total_segments):  # Walk all names, just show first 3
+        seg_name_end, seg_name_size = find_string(data, offset)
+        if i < 3:
+            seg_name = str(view[offset:seg_name_end], 'utf-8', 'ignore')
+            yield f"  Segment {i+1} name: '{seg_name}' (size={seg_name_size})"
+        offset += seg_name_size
+
+    yield f"After all segment names: {offset:#x}"
+
+    # Layer info
+    yield f"\nLayer info at {offset:#x}"
+    layer_info = np.frombuffer(data, LAYER_INFO_DTYPE, count=total_layers, offset=offset)
+    for i, (block_size_pad, interleave, frame_size, block_size, layer_start) in enumerate(layer_info.tolist()):
+        yield f"  Layer {i+1}: block_size_pad={block_size_pad}, interleave={interleave}, frame_size={frame_size}, block_size={block_size}, layer_start={layer_start}"
+    offset += layer_info.nbytes
+
+    yield f"After layer info: {offset:#x}"
+
+    # Layer config
+    yield f"\nLayer config at {offset:#x}"
+    unpack_layer_config = LAYER_CONFIG.unpack_from
+    rows = []
+    for _ in range(total_layers):
+        row = unpack_layer_config(data, offset)
+        rows.append(row)
+        offset += 0x2c + EXTRA_BY_CODEC.get(row[2], 0) + 0x04  # config, codec extra, padding
+    layer_configs = np.array(rows, dtype=LAYER_CONFIG_DTYPE)
+    for i, (sample_rate, channels, codec) in enumerate(layer_configs.tolist()):
+        yield f"  Layer {i+1}: sample_rate={sample_rate}, channels={channels}, codec={codec:#x}"
+
+    yield f"After layer config: {offset:#x}"
+
+def iter_rws(data, view, summary=False):
+    """Report lines for the whole header chunk, or just the header with summary"""
+    header = parse_header(data)
+    yield from iter_header(header)
+    if summary:
+        return
+    yield from parse_tables(data, view, header)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--summary", action="store_true", help="only read the chunk headers and segment/layer counts")
+    args = parser.parse_args()
+
+    # Tables below are np.frombuffer views into the map, which stays open until exit
+    with open('banquetAudioStreamUS.rws', 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # Slicing the map copies; slicing a memoryview of it doesn't. find stays on the map
+    view = memoryview(data)
+
+    # Lines are collected and written in one go rather than printed one by one;
+    # the finally still writes whatever was parsed if a table runs off the end
+    out = []
+    try:
+        out.extend(iter_rws(data, view, args.summary))
+    finally:
+        sys.stdout.write("\n".join(out) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 import struct
 import uuid
 import json
+import mmap
 import subprocess
 import os
-import copy
 from pathlib import Path
+
+import numpy as np
 from rich.pretty import Pretty
 from rich.console import Console
 
@@ -25,8 +27,24 @@ class AudioStream:
     VGMSTREAM_MAX_SAMPLE_RATE = 384000
     VGMSTREAM_MAX_SUBSONGS = 100000
     
-    def __init__(self, channels: int = 1, loop_flag: bool = False):
-        """Initialize an audio stream (equivalent to allocate_vgmstream)"""
+    # Fixed field set; setup() snapshots these in this order
+    _STATE_FIELDS = (
+        "channels", "sample_rate", "num_samples", "loop_flag",
+        "loop_start_sample", "loop_end_sample", "loop_target",
+        "coding_type", "layout_type", "meta_type", "codec_data", "layout_data",
+        "interleave_block_size", "interleave_last_block_size",
+        "interleave_first_block_size", "interleave_first_skip",
+        "stream_index", "num_streams", "channel_layout", "frame_size", "allow_dual_stereo",
+        "block_size", "usable_size", "data_start",
+    )
+    __slots__ = _STATE_FIELDS + ("start_state", "_enable_reset")
+    
+    def __init__(self, channels: int = 1, loop_flag: bool = False, enable_reset: bool = False):
+        """Initialize an audio stream (equivalent to allocate_vgmstream)
+        
+        Pass enable_reset=True to have setup() keep a snapshot for reset();
+        otherwise reset() does nothing.
+        """
         if channels <= 0 or channels > self.VGMSTREAM_MAX_CHANNELS:
             raise ValueError(f"Invalid channels: {channels} (max {self.VGMSTREAM_MAX_CHANNELS})")
         
@@ -66,26 +84,32 @@ class AudioStream:
         
         # State tracking for seeking/reset capability
         self.start_state = None  # Snapshot of initial state
+        self._enable_reset = enable_reset
     
     def prepare(self) -> bool:
         """Validate stream parameters before playback (based on vgmstream's prepare_vgmstream)"""
         
-        # Check num_samples validity
-        if self.num_samples <= 0:
-            print(f"ERROR: Invalid num_samples {self.num_samples} (must be > 0)")
-            return False
+        max_num_samples = self.VGMSTREAM_MAX_NUM_SAMPLES
+        min_sample_rate = self.VGMSTREAM_MIN_SAMPLE_RATE
+        max_sample_rate = self.VGMSTREAM_MAX_SAMPLE_RATE
+        num_samples = self.num_samples
+        sample_rate = self.sample_rate
         
-        if self.num_samples > self.VGMSTREAM_MAX_NUM_SAMPLES:
-            print(f"ERROR: num_samples {self.num_samples} exceeds max {self.VGMSTREAM_MAX_NUM_SAMPLES}")
+        # Check num_samples validity; one range test, the bound is only
+        # worked out for the message
+        if not 0 < num_samples <= max_num_samples:
+            if num_samples <= 0:
+                print(f"ERROR: Invalid num_samples {num_samples} (must be > 0)")
+            else:
+                print(f"ERROR: num_samples {num_samples} exceeds max {max_num_samples}")
             return False
         
         # Check sample rate validity
-        if self.sample_rate < self.VGMSTREAM_MIN_SAMPLE_RATE:
-            print(f"ERROR: sample_rate {self.sample_rate} Hz below minimum {self.VGMSTREAM_MIN_SAMPLE_RATE}")
-            return False
-        
-        if self.sample_rate > self.VGMSTREAM_MAX_SAMPLE_RATE:
-            print(f"ERROR: sample_rate {self.sample_rate} Hz exceeds maximum {self.VGMSTREAM_MAX_SAMPLE_RATE}")
+        if not min_sample_rate <= sample_rate <= max_sample_rate:
+            if sample_rate < min_sample_rate:
+                print(f"ERROR: sample_rate {sample_rate} Hz below minimum {min_sample_rate}")
+            else:
+                print(f"ERROR: sample_rate {sample_rate} Hz exceeds maximum {max_sample_rate}")
             return False
         
         # Validate and sanitize loops
@@ -113,14 +137,13 @@ class AudioStream:
         
         # Validate channel layout
         if self.channel_layout > 0:
-            bit_count = 0
-            for bit_pos in range(32):
-                if (self.channel_layout >> bit_pos) & 1:
-                    if bit_pos > 17:  # Unknown past standard layout
-                        print(f"WARNING: Invalid channel_layout bit {bit_pos}, clearing")
-                        self.channel_layout = 0
-                        break
-                    bit_count += 1
+            # Bits 0-17 are the standard speaker positions; 18-31 are unknown
+            bit_count = bin(self.channel_layout & 0x3FFFF).count("1")
+            invalid_bits = self.channel_layout & 0xFFFC0000
+            if invalid_bits:
+                bit_pos = (invalid_bits & -invalid_bits).bit_length() - 1  # lowest unknown bit
+                print(f"WARNING: Invalid channel_layout bit {bit_pos}, clearing")
+                self.channel_layout = 0
             
             if bit_count != self.channels:
                 print(f"WARNING: channel_layout has {bit_count} bits but channels={self.channels}, clearing")
@@ -140,13 +163,19 @@ class AudioStream:
     
     def setup(self) -> None:
         """Final setup before playback (equivalent to setup_vgmstream)"""
-        # Save initial state for seeking/reset capability
-        self.start_state = copy.deepcopy(self.__dict__)
+        if not self._enable_reset:
+            return
+        
+        # Save initial state for seeking/reset capability; the fields are
+        # scalars (codec/layout data are kept by reference), so a flat
+        # tuple is enough
+        self.start_state = tuple(getattr(self, f) for f in self._STATE_FIELDS)
     
     def reset(self) -> None:
         """Reset to initial state (equivalent to reset_vgmstream)"""
         if self.start_state:
-            self.__dict__ = copy.deepcopy(self.start_state)
+            for field, value in zip(self._STATE_FIELDS, self.start_state):
+                setattr(self, field, value)
     
     def close(self) -> None:
         """Clean up resources (equivalent to close_vgmstream)"""
@@ -170,6 +199,14 @@ class AudioStream:
                 # Mark loop state as ready
                 pass
         
+        # Nothing changes, so the snapshot from the last setup() still holds
+        unchanged = loop_flag == self.loop_flag and (
+            not loop_flag
+            or (loop_start == self.loop_start_sample and loop_end == self.loop_end_sample)
+        )
+        if unchanged and self.start_state is not None:
+            return True
+        
         self.loop_flag = loop_flag
         if loop_flag:
             self.loop_start_sample = loop_start
@@ -196,12 +233,52 @@ class AudioStream:
                 f"loop={self.loop_flag})")
 
 
+# Single-field Structs compiled once per byte order; Parser.endian picks the set
+_STRUCTS = {
+    endian: {code: struct.Struct(endian + code) for code in "BbHhIiQqfd"}
+    for endian in "<>"
+}
+
+# Multi-field header records read in one unpack, per byte order
+_RECORD_STRUCTS = {
+    endian: {
+        "base_counts": struct.Struct(endian + "32xI4xI"),   # total_segments @0x20, total_layers @0x28
+        "layer_config": struct.Struct(endian + "I9xB14xI"),  # sample_rate @0x00, channels @0x0d, codec @0x1c
+    }
+    for endian in "<>"
+}
+
+# Fixed-stride header chunk tables, decoded whole with np.frombuffer; one set
+# per byte order like _STRUCTS
+_TABLE_DTYPES = {
+    endian: {
+        "segment_info": np.dtype({
+            "names": ["layers_size", "offset"],
+            "formats": [endian + "u4", endian + "u4"],
+            "offsets": [0x18, 0x1c],
+            "itemsize": 0x20,
+        }),
+        "usable_size": np.dtype(endian + "u4"),
+        "layer_info": np.dtype({
+            "names": ["block_size_pad", "interleave", "frame_size", "block_size", "layer_start"],
+            "formats": [endian + "u4", endian + "u2", endian + "u2", endian + "u4", endian + "u4"],
+            "offsets": [0x10, 0x18, 0x1a, 0x20, 0x24],
+            "itemsize": 0x28,
+        }),
+    }
+    for endian in "<>"
+}
+
+
 class Parser:
     def __init__(self, data: bytes, endian: str = "little"):
-        if not isinstance(data, (bytes, bytearray)):
-            raise TypeError("data must be bytes or bytearray")
+        if not isinstance(data, (bytes, bytearray, mmap.mmap)):
+            raise TypeError("data must be bytes, bytearray or mmap")
 
         self.data = data
+        # Strings decode straight from this view instead of from a sliced copy;
+        # searching stays on data, which has find
+        self.view = memoryview(data)
         self.offset = 0
 
         if endian == "little":
@@ -211,18 +288,30 @@ class Parser:
         else:
             raise ValueError("endian must be 'little' or 'big'")
 
+    @property
+    def endian(self) -> str:
+        return self._endian
+
+    @endian.setter
+    def endian(self, endian: str):
+        # Rebinding the Struct set here keeps _read down to one lookup, and
+        # stays right when readRWS switches byte order after guessing it
+        self._structs = _STRUCTS[endian]
+        self._endian = endian
+
     # -------------------------
     # Core helpers
     # -------------------------
 
-    def _read(self, fmt: str):
-        size = struct.calcsize(fmt)
-        if self.offset + size > len(self.data):
+    def _read(self, code: str):
+        st = self._structs[code]
+        end = self.offset + st.size
+        if end > len(self.data):
             raise EOFError("Attempt to read past end of buffer")
 
-        value = struct.unpack_from(fmt, self.data, self.offset)
-        self.offset += size
-        return value[0] if len(value) == 1 else value
+        value = st.unpack_from(self.data, self.offset)[0]
+        self.offset = end
+        return value
 
     def read(self, size: int) -> bytes:
         """
@@ -255,38 +344,38 @@ class Parser:
     # -------------------------
 
     def readUint8(self):
-        return self._read(self.endian + "B")
+        return self._read("B")
 
     def readInt8(self):
-        return self._read(self.endian + "b")
+        return self._read("b")
 
     def readUint16(self):
-        return self._read(self.endian + "H")
+        return self._read("H")
 
     def readInt16(self):
-        return self._read(self.endian + "h")
+        return self._read("h")
 
     def readUint32(self):
-        return self._read(self.endian + "I")
+        return self._read("I")
 
     def readInt32(self):
-        return self._read(self.endian + "i")
+        return self._read("i")
 
     def readUint64(self):
-        return self._read(self.endian + "Q")
+        return self._read("Q")
 
     def readInt64(self):
-        return self._read(self.endian + "q")
+        return self._read("q")
 
     # -------------------------
     # Floating point
     # -------------------------
 
     def readFloat(self):
-        return self._read(self.endian + "f")
+        return self._read("f")
 
     def readDouble(self):
-        return self._read(self.endian + "d")
+        return self._read("d")
 
     # -------------------------
     # Raw / strings
@@ -301,15 +390,12 @@ class Parser:
         return b
 
     def readCString(self, encoding="utf-8") -> str:
-        start = self.offset
-        while self.offset < len(self.data) and self.data[self.offset] != 0:
-            self.offset += 1
-
-        if self.offset >= len(self.data):
+        end = self.data.find(b"\x00", self.offset)
+        if end < 0:
             raise EOFError("Unterminated C string")
 
-        s = self.data[start : self.offset].decode(encoding)
-        self.offset += 1  # skip null byte
+        s = str(self.view[self.offset : end], encoding)
+        self.offset = end + 1  # skip null byte
         return s
 
     def readPaddedCString(self, alignment=4, encoding="utf-8") -> str:
@@ -338,6 +424,18 @@ class Parser:
 
 class RWSHeader:
     """Represents the RWS audio header structure"""
+    __slots__ = (
+        "big_endian",
+        "codec", "channels", "sample_rate", "interleave", "frame_size",
+        "file_name_offset",
+        "total_segments", "target_segment", "segment_offset", "segment_layers_size", "segment_name_offset",
+        "total_layers", "target_layer", "layer_start", "layer_name_offset",
+        "file_size", "header_size", "data_size", "data_offset",
+        "usable_size", "block_size", "block_layers_size",
+        "coefs_offset", "hist_offset",
+        "readable_name",
+    )
+
     def __init__(self):
         self.big_endian = False
         
@@ -358,6 +456,7 @@ class RWSHeader:
         self.total_layers = 0
         self.target_layer = 0
         self.layer_start = 0
+        self.layer_name_offset = 0
         
         self.file_size = 0
         self.header_size = 0
@@ -377,22 +476,32 @@ class RWSHeader:
 def get_rws_string_size(p: Parser, offset: int) -> int:
     """RWS strings are null-terminated then padded to 0x10"""
     p.seek(offset)
-    i = 0
-    while i < 255:  # arbitrary max
-        if p.readUint8() == 0:  # null terminator
-            return i + (0x10 - (i % 0x10))  # size is padded
-        i += 1
-    return 0
+    end = p.data.find(b"\x00", offset, offset + 255)  # arbitrary max
+    if end < 0:
+        if not p.canRead(255):
+            raise EOFError("Attempt to read past end of buffer")
+        p.skip(255)
+        return 0
+    p.seek(end + 1)  # leave the parser past the terminator
+    i = end - offset
+    return i + (0x10 - (i % 0x10))  # size is padded
 
 
 def get_rws_string_size_from_data(data: bytes, offset: int) -> int:
     """RWS strings are null-terminated then padded to 0x10 - works directly on bytes"""
-    i = 0
-    while i < 255:  # arbitrary max
-        if data[offset + i] == 0:  # null terminator
-            return i + (0x10 - (i % 0x10))  # size is padded
-        i += 1
-    return 0
+    end = data.find(b"\x00", offset, offset + 255)  # arbitrary max
+    if end < 0:
+        return 0
+    i = end - offset
+    return i + (0x10 - (i % 0x10))  # size is padded
+
+
+def read_rws_string(data: bytes, offset: int, max_size: int = 256) -> str:
+    """Decode the null-terminated RWS string at offset (at most max_size bytes)"""
+    end = data.find(b"\x00", offset, offset + max_size)
+    if end < 0:
+        end = offset + max_size
+    return data[offset:end].decode("utf-8", errors="ignore")
 
 
 def guess_endian32(p: Parser, offset: int) -> bool:
@@ -470,23 +579,16 @@ def readRWS(data, target_subsong=0):
     offset = 0x18
     
     # Guess endianness from base header at offset+0x00
-    test_val = struct.unpack_from('<I', data, offset)[0]
+    test_val = _STRUCTS["<"]["I"].unpack_from(data, offset)[0]
     rws.big_endian = (test_val & 0xFF000000) != 0
     
-    if rws.big_endian:
-        p.endian = ">"
-        read_u32 = lambda off: struct.unpack_from('>I', data, off)[0]
-        read_u16 = lambda off: struct.unpack_from('>H', data, off)[0]
-        read_u8 = lambda off: struct.unpack_from('>B', data, off)[0]
-    else:
-        p.endian = "<"
-        read_u32 = lambda off: struct.unpack_from('<I', data, off)[0]
-        read_u16 = lambda off: struct.unpack_from('<H', data, off)[0]
-        read_u8 = lambda off: struct.unpack_from('<B', data, off)[0]
+    p.endian = ">" if rws.big_endian else "<"
+    read_u32 = _STRUCTS[p.endian]["I"].unpack_from
+    record_structs = _RECORD_STRUCTS[p.endian]
+    table_dtypes = _TABLE_DTYPES[p.endian]
     
     # Base header (0x50 bytes)
-    rws.total_segments = read_u32(offset + 0x20)
-    rws.total_layers = read_u32(offset + 0x28)
+    rws.total_segments, rws.total_layers = record_structs["base_counts"].unpack_from(data, offset)
     offset += 0x50
     
     # Audio file name (null-terminated, padded to 0x10)
@@ -515,18 +617,16 @@ def readRWS(data, target_subsong=0):
     }
     
     # Segment info (0x20 bytes per segment)
-    for i in range(rws.total_segments):
-        if i + 1 == rws.target_segment:
-            rws.segment_layers_size = read_u32(offset + 0x18)
-            rws.segment_offset = read_u32(offset + 0x1c)
-        offset += 0x20
+    segments = np.frombuffer(data, table_dtypes["segment_info"], count=rws.total_segments, offset=offset)
+    target = segments[rws.target_segment - 1]
+    rws.segment_layers_size = int(target["layers_size"])
+    rws.segment_offset = int(target["offset"])
+    offset += segments.nbytes
     
     # Usable layer sizes (0x04 bytes per layer*segment)
-    for i in range(rws.total_segments * rws.total_layers):
-        usable_size = read_u32(offset)
-        if i + 1 == target_subsong:
-            rws.usable_size = usable_size
-        offset += 0x04
+    usable_sizes = np.frombuffer(data, table_dtypes["usable_size"], count=total_subsongs, offset=offset)
+    rws.usable_size = int(usable_sizes[target_subsong - 1])
+    offset += usable_sizes.nbytes
     
     # Segment UUIDs (0x10 bytes per segment)
     offset += 0x10 * rws.total_segments
@@ -538,26 +638,27 @@ def readRWS(data, target_subsong=0):
         offset += get_rws_string_size_from_data(data, offset)
     
     # Layer info (0x28 bytes per layer)
-    for i in range(rws.total_layers):
-        if i + 1 == rws.target_layer:
-            rws.interleave = read_u16(offset + 0x18)
-            rws.frame_size = read_u16(offset + 0x1a)
-            rws.block_size = read_u32(offset + 0x20)
-            rws.layer_start = read_u32(offset + 0x24)
-        
-        # Track block_layers_size for all layers
-        block_size_pad = read_u32(offset + 0x10)
-        rws.block_layers_size += block_size_pad
-        offset += 0x28
+    layers = np.frombuffer(data, table_dtypes["layer_info"], count=rws.total_layers, offset=offset)
+    target = layers[rws.target_layer - 1]
+    rws.interleave = int(target["interleave"])
+    rws.frame_size = int(target["frame_size"])
+    rws.block_size = int(target["block_size"])
+    rws.layer_start = int(target["layer_start"])
+    
+    # Track block_layers_size for all layers; u4 fields are summed in 64 bits
+    # so the total cannot wrap where the default accumulator is 32-bit
+    rws.block_layers_size = int(layers["block_size_pad"].sum(dtype=np.uint64))
+    offset += layers.nbytes
     
     # Layer config (0x2c bytes base per layer)
+    unpack_layer_config = record_structs["layer_config"].unpack_from
     for i in range(rws.total_layers):
         if i + 1 == rws.target_layer:
-            rws.sample_rate = read_u32(offset + 0x00)
-            rws.channels = read_u8(offset + 0x0d)
-            rws.codec = read_u32(offset + 0x1c)
+            rws.sample_rate, rws.channels, layer_codec = unpack_layer_config(data, offset)
+            rws.codec = layer_codec
+        else:
+            layer_codec = read_u32(data, offset + 0x1c)[0]
         
-        layer_codec = read_u32(offset + 0x1c)
         offset += 0x2c
         
         # DSP has extra 0x60 bytes
@@ -569,16 +670,25 @@ def readRWS(data, target_subsong=0):
         
         offset += 0x04  # padding
     
+    # Layer UUIDs (0x10 bytes per layer)
+    offset += 0x10 * rws.total_layers
+    
+    # Layer names (variable size, padded to 0x10)
+    for i in range(rws.total_layers):
+        if i + 1 == rws.target_layer:
+            rws.layer_name_offset = offset
+        offset += get_rws_string_size_from_data(data, offset)
+    
     # Calculate total samples based on codec type
     stream_size = rws.usable_size
     num_samples = calculate_samples(rws.codec, stream_size, rws.channels)
     
     # Build readable name
-    file_name = data[rws.file_name_offset:rws.file_name_offset+256].split(b'\x00')[0].decode('utf-8', errors='ignore')
-    segment_name = data[rws.segment_name_offset:rws.segment_name_offset+256].split(b'\x00')[0].decode('utf-8', errors='ignore')
+    file_name = read_rws_string(data, rws.file_name_offset)
+    segment_name = read_rws_string(data, rws.segment_name_offset)
     
     if rws.total_layers > 1:
-        layer_name = data[rws.layer_name_offset:rws.layer_name_offset+256].split(b'\x00')[0].decode('utf-8', errors='ignore')
+        layer_name = read_rws_string(data, rws.layer_name_offset)
         readable_name = f"{file_name}/{segment_name}/{layer_name}"
     else:
         readable_name = f"{file_name}/{segment_name}"
@@ -606,7 +716,7 @@ def readRWS(data, target_subsong=0):
     
     # Create and validate AudioStream (vgmstream-style)
     try:
-        stream = AudioStream(channels=rws.channels, loop_flag=False)
+        stream = AudioStream(channels=rws.channels, loop_flag=False, enable_reset=False)
         stream.sample_rate = rws.sample_rate
         stream.num_samples = num_samples
         stream.coding_type = get_codec_name(rws.codec)
@@ -632,45 +742,46 @@ def readRWS(data, target_subsong=0):
     return output
 
 
+# Codec UUID -> (name, sample ratio). A ratio (per_channel, frame_bytes, frame_samples)
+# gives samples = (stream_size, divided by channels if per_channel) // frame_bytes * frame_samples
+_CODEC_INFO = {
+    0xD9EA9798: ("PS-ADPCM", (True, 1, 2)),         # PS ADPCM = 16 samples per 16 bytes per channel
+    0xD01BD217: ("PCM", (True, 2, 1)),              # PCM16 = 2 bytes per sample per channel
+    0xDA1E4382: ("Float", None),
+    0xF86215B0: ("DSP ADPCM", (True, 8, 14)),       # DSP = 14 samples per 8 bytes per channel
+    0x632FA22B: ("Xbox IMA ADPCM", (False, 1, 2)),  # IMA ADPCM = 4-bit = 2 samples per byte
+    0x3F1D8147: ("WMA", None),
+    0xBACFB36E: ("MP3", None),
+    0x34D09A54: ("MP2", None),
+    0x04C15BA7: ("MP1", None),
+    0xA30DB390: ("AC3", None),
+    0xEF386593: ("IMA ADPCM (PC)", (False, 1, 2)),
+}
+# Fallback: assume some generic ratio
+_DEFAULT_RATIO = (False, 1, 1)
+
+
 def calculate_samples(codec: int, stream_size: int, channels: int) -> int:
     """Calculate total samples from stream size based on codec type"""
-    if codec == 0xD01BD217:  # PCM
-        # PCM16 = 2 bytes per sample per channel
-        return stream_size // (2 * channels)
-    elif codec == 0xD9EA9798:  # PS-ADPCM
-        # PS ADPCM = 16 samples per 16 bytes per channel
-        return (stream_size // channels) * 2
-    elif codec == 0xF86215B0:  # DSP ADPCM
-        # DSP = 14 samples per 8 bytes per channel
-        bytes_per_channel = stream_size // channels
-        return (bytes_per_channel // 8) * 14
-    elif codec == 0xEF386593 or codec == 0x632FA22B:  # IMA ADPCM (PC or Xbox)
-        # IMA ADPCM = 4-bit = 2 samples per byte
-        return stream_size * 2
-    else:
-        # Fallback: assume some generic ratio
-        return stream_size
+    _, ratio = _CODEC_INFO.get(codec, (None, None))
+    per_channel, frame_bytes, frame_samples = ratio or _DEFAULT_RATIO
+    if per_channel:
+        stream_size //= channels
+    return stream_size // frame_bytes * frame_samples
 
 
 def get_codec_name(codec: int) -> str:
     """Return codec name from UUID"""
-    codec_map = {
-        0xD9EA9798: "PS-ADPCM",
-        0xD01BD217: "PCM",
-        0xDA1E4382: "Float",
-        0xF86215B0: "DSP ADPCM",
-        0x632FA22B: "Xbox IMA ADPCM",
-        0x3F1D8147: "WMA",
-        0xBACFB36E: "MP3",
-        0x34D09A54: "MP2",
-        0x04C15BA7: "MP1",
-        0xA30DB390: "AC3",
-        0xEF386593: "IMA ADPCM (PC)",
-    }
-    return codec_map.get(codec, f"Unknown ({hex(codec)})")
+    info = _CODEC_INFO.get(codec)
+    return info[0] if info else f"Unknown ({hex(codec)})"
+
+
+# WAVEFORMATEX fields and the IMA ADPCM extension (cbSize, samplesPerBlock)
+_WAV_FMT = struct.Struct("<HHIIHH")
+_WAV_FMT_IMA_EXTRA = struct.Struct("<HH")
 
 
-def create_wav_header(rws_info: dict, audio_data: bytes) -> bytes:
+def create_wav_header(rws_info: dict, data_size: int) -> bytes:
     """Create a proper WAV file header for IMA ADPCM audio (based on vgmstream's output)"""
     
     audio_info = rws_info["audio_info"]
@@ -710,8 +821,10 @@ def create_wav_header(rws_info: dict, audio_data: bytes) -> bytes:
     byte_rate = (sample_rate * channels * bits_per_sample) // 8
     block_align = frame_size if frame_size > 0 else (channels * bits_per_sample) // 8
     
+    pack_u32 = _STRUCTS["<"]["I"].pack
+    
     # Build fmt chunk
-    fmt_data = struct.pack("<HHIIHH",
+    fmt_data = _WAV_FMT.pack(
         wave_format,           # Audio format (0x0011 for IMA ADPCM)
         channels,              # Number of channels
         sample_rate,           # Sample rate
@@ -722,30 +835,93 @@ def create_wav_header(rws_info: dict, audio_data: bytes) -> bytes:
     
     # Add cbSize and samplesPerBlock for IMA ADPCM
     if wave_format == WAVE_FORMAT_IMA_ADPCM:
-        fmt_data += struct.pack("<HH",
+        fmt_data += _WAV_FMT_IMA_EXTRA.pack(
             2,                 # cbSize (size of extra format info)
             samples_per_block  # samplesPerBlock
         )
     
-    fmt_chunk = b"fmt " + struct.pack("<I", len(fmt_data)) + fmt_data
-    
-    # Build data chunk
-    data_chunk = b"data" + struct.pack("<I", len(audio_data)) + audio_data
+    fmt_chunk_size = 8 + len(fmt_data)
+    data_chunk_size = 8 + data_size
     
     # Calculate RIFF size (everything after the "RIFF xxxx" part)
-    riff_size = 4 + len(fmt_chunk) + len(data_chunk)  # 4 for "WAVE"
+    riff_size = 4 + fmt_chunk_size + data_chunk_size  # 4 for "WAVE"
     
-    # Build RIFF header
-    riff_header = b"RIFF" + struct.pack("<I", riff_size) + b"WAVE"
+    # RIFF header, fmt chunk and the data chunk header; the audio follows it
+    return b"".join((
+        b"RIFF", pack_u32(riff_size), b"WAVE",
+        b"fmt ", pack_u32(len(fmt_data)), fmt_data,
+        b"data", pack_u32(data_size),
+    ))
+
+
+def copy_file_span(src_fd: int, dst, offset: int, size: int, chunk_size: int = 1 << 20) -> None:
+    """Append size bytes at offset in src_fd to the file object dst without reading them into Python"""
+    dst.flush()
+    dst_fd = dst.fileno()
+    if hasattr(os, "sendfile"):
+        try:
+            while size > 0:
+                sent = os.sendfile(dst_fd, src_fd, offset, size)
+                if sent == 0:
+                    break
+                offset += sent
+                size -= sent
+            return
+        except OSError:
+            pass  # e.g. no file-to-file sendfile here; copy the rest by hand
     
-    return riff_header + fmt_chunk + data_chunk
+    os.lseek(src_fd, offset, os.SEEK_SET)
+    while size > 0:
+        chunk = os.read(src_fd, min(chunk_size, size))
+        if not chunk:
+            break
+        dst.write(chunk)
+        size -= len(chunk)
+
+
+def write_wav(out_path, rws_info: dict, src_fd: int, data_start: int, usable_size: int) -> int:
+    """Write a WAV file from the audio span of an open RWS file; returns the file size"""
+    header = create_wav_header(rws_info, usable_size)
+    with open(out_path, "wb") as f:
+        f.write(header)
+        copy_file_span(src_fd, f, data_start, usable_size)
+    return len(header) + usable_size
+
+
+# Extraction metadata; audio_info supplies the per-stream fields
+_META_TEMPLATE = """\
+RWS Audio Extraction Metadata
+========================================
+
+Stream Name: {stream_name}
+Codec: {codec_name} ({codec})
+Sample Rate: {sample_rate} Hz
+Channels: {channels}
+Total Samples: {total_samples}
+Duration: {duration_seconds:.3f} seconds
+Block Size: {block_size} bytes
+Frame Size: {frame_size} bytes
+Raw Data Size: {raw_size} bytes
+
+{validation}
+Output File: {output_file}
+Format: {format_name}
+"""
+
+_META_VALIDATION_TEMPLATE = """\
+Stream Validation: PASSED
+  - Channels: {stream.channels} (max {stream.VGMSTREAM_MAX_CHANNELS})
+  - Sample Rate: {stream.sample_rate} Hz (min {stream.VGMSTREAM_MIN_SAMPLE_RATE}, max {stream.VGMSTREAM_MAX_SAMPLE_RATE})
+  - Num Samples: {stream.num_samples} (max {stream.VGMSTREAM_MAX_NUM_SAMPLES})
+  - Duration: {duration_seconds:.3f} seconds
+"""
 
 
 def decode_rws_audio(rws_file: str, rws_info: dict, output_format: str = "wav"):
     """Extract RWS audio data to WAV file with proper format headers"""
     try:
-        with open(rws_file, "rb") as f:
-            data = f.read()
+        # The audio is copied file to file below, never loaded whole
+        rws_size = os.path.getsize(rws_file)
         
         # Check if stream was validated
         if not rws_info.get("stream_validated", False):
@@ -782,61 +958,49 @@ def decode_rws_audio(rws_file: str, rws_info: dict, output_format: str = "wav"):
             print(f"    [Audio Stream] {audio_stream}")
             print(f"    [Stream State] Validated and ready for playback")
         
-        audio_data = data[data_start:data_start + usable_size]
+        # Clamped to the end of the file, as slicing the data would be
+        audio_size = max(0, min(usable_size, rws_size - data_start))
         
         # Create WAV file
         if output_format.lower() == "wav":
             wav_file = output_dir / f"{safe_name}.wav"
-            wav_data = create_wav_header(rws_info, audio_data)
-            
-            with open(wav_file, "wb") as f:
-                f.write(wav_data)
+            with open(rws_file, "rb") as src:
+                wav_size = write_wav(wav_file, rws_info, src.fileno(), data_start, audio_size)
             
             print(f"\n[SUCCESS] Audio extracted to WAV!")
             print(f"    Output: {wav_file}")
-            print(f"    File Size: {len(wav_data) / 1024:.2f} KB")
+            print(f"    File Size: {wav_size / 1024:.2f} KB")
             output_file = wav_file
         else:
             # Fallback to raw format
             raw_file = output_dir / f"{safe_name}.ima"
-            with open(raw_file, "wb") as f:
-                f.write(audio_data)
+            with open(rws_file, "rb") as src, open(raw_file, "wb") as f:
+                copy_file_span(src.fileno(), f, data_start, audio_size)
             
             print(f"\n[SUCCESS] Audio data extracted (raw)!")
             print(f"    Output: {raw_file}")
-            print(f"    Size: {len(audio_data) / 1024:.2f} KB")
+            print(f"    Size: {audio_size / 1024:.2f} KB")
             output_file = raw_file
         
-        # Create a metadata file
+        # Create a metadata file, filled in from the templates and written in one go
         meta_file = output_dir / f"{safe_name}.txt"
-        with open(meta_file, "w") as f:
-            f.write("RWS Audio Extraction Metadata\n")
-            f.write("=" * 40 + "\n\n")
-            f.write(f"Stream Name: {stream_name}\n")
-            f.write(f"Codec: {rws_info['codec_info']} ({rws_info['audio_info']['codec']})\n")
-            f.write(f"Sample Rate: {audio_info['sample_rate']} Hz\n")
-            f.write(f"Channels: {audio_info['channels']}\n")
-            f.write(f"Total Samples: {audio_info['total_samples']}\n")
-            f.write(f"Duration: {audio_info['duration_seconds']:.3f} seconds\n")
-            f.write(f"Block Size: {audio_info['block_size']} bytes\n")
-            f.write(f"Frame Size: {audio_info['frame_size']} bytes\n")
-            f.write(f"Raw Data Size: {len(audio_data)} bytes\n")
-            
-            # Add stream validation status
-            if audio_stream:
-                f.write(f"\nStream Validation: PASSED\n")
-                f.write(f"  - Channels: {audio_stream.channels} (max {audio_stream.VGMSTREAM_MAX_CHANNELS})\n")
-                f.write(f"  - Sample Rate: {audio_stream.sample_rate} Hz (min {audio_stream.VGMSTREAM_MIN_SAMPLE_RATE}, max {audio_stream.VGMSTREAM_MAX_SAMPLE_RATE})\n")
-                f.write(f"  - Num Samples: {audio_stream.num_samples} (max {audio_stream.VGMSTREAM_MAX_NUM_SAMPLES})\n")
-                f.write(f"  - Duration: {audio_stream.get_duration_seconds():.3f} seconds\n")
-            else:
-                f.write(f"\nStream Validation: NOT AVAILABLE\n")
-            
-            f.write(f"\nOutput File: {output_file.name}\n")
-            if output_format.lower() == "wav":
-                f.write(f"Format: WAV (RIFF) with IMA ADPCM encoding\n")
-            else:
-                f.write(f"Format: Raw audio data\n")
+        if audio_stream:
+            validation = _META_VALIDATION_TEMPLATE.format(
+                stream=audio_stream,
+                duration_seconds=audio_stream.get_duration_seconds(),
+            )
+        else:
+            validation = "Stream Validation: NOT AVAILABLE\n"
+        
+        meta_file.write_text(_META_TEMPLATE.format_map(dict(
+            audio_info,
+            stream_name=stream_name,
+            codec_name=rws_info["codec_info"],
+            raw_size=audio_size,
+            validation=validation,
+            output_file=output_file.name,
+            format_name="WAV (RIFF) with IMA ADPCM encoding" if output_format.lower() == "wav" else "Raw audio data",
+        )))
         
         print(f"    Metadata: {meta_file}")
         return True
@@ -849,11 +1013,15 @@ def decode_rws_audio(rws_file: str, rws_info: dict, output_format: str = "wav"):
 
 
 if __name__ == "__main__":
+    # The Parser's view and the np.frombuffer tables point into the map, so it
+    # stays open until exit; closing it while a failed parse's traceback still
+    # holds them would raise BufferError over the real error
     with open("banquetAudioStreamUS.rws", "rb") as f:
-        result = readRWS(f.read())
-        if result:
-            console = Console(force_terminal=True)
-            console.print(Pretty(result, expand_all=True))
-            
-            # Extract and decode audio
-            decode_rws_audio("banquetAudioStreamUS.rws", result, output_format="wav")
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    result = readRWS(data)
+    if result:
+        console = Console(force_terminal=True)
+        console.print(Pretty(result, expand_all=True))
+        
+        # Extract and decode audio
+        decode_rws_audio("banquetAudioStreamUS.rws", result, output_format="wav")
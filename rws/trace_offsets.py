@@ -1,12 +1,25 @@
 import struct
 
-def read_string_size(data, offset):
-    i = 0
-    while i < 255:
-        if data[offset + i] == 0:
-            return i + (0x10 - (i % 0x10))
-        i += 1
-    return 0
+import numpy as np
+
+def read_string_sizes(data, offset, count):
+    """Padded sizes of count back-to-back RWS strings starting at offset
+
+    Each string is null-terminated then padded to 0x10, so none spans more than
+    0x100 bytes; the nulls in that span are found in one scan and walked
+    """
+    span = min(len(data) - offset, count * 0x100)
+    nulls = np.flatnonzero(np.frombuffer(data, np.uint8, count=span, offset=offset) == 0)
+    sizes = []
+    pos = 0
+    for _ in range(count):
+        k = nulls.searchsorted(pos)  # first null at or after pos
+        i = int(nulls[k]) - pos if k < len(nulls) else 255
+        # No null in the first 255 bytes reads as size 0, like the old byte loop
+        size = i + (0x10 - (i % 0x10)) if i < 255 else 0
+        sizes.append(size)
+        pos += size
+    return sizes
 
 with open('banquetAudioStreamUS.rws', 'rb') as f:
     data = f.read()
@@ -18,8 +31,7 @@ print(f'Segment names start at: {hex(offset)}')
 # Read all segment names
 total_segments = 417
 all_names_size = 0
-for i in range(total_segments):
-    name_size = read_string_size(data, offset)
+for i, name_size in enumerate(read_string_sizes(data, offset, total_segments)):
     if i < 10:
         name = data[offset:offset+name_size].rstrip(b'\x00').decode('utf-8', errors='ignore')
         print(f'  Segment {i+1}: size={hex(name_size)}, name="{name}"')
@@ -1,37 +1,92 @@
 import os
 import argparse
 import binascii
+import mmap
+import re
+from concurrent.futures import ProcessPoolExecutor
 
-def search_guid(folder, guid, ascii_mode=False):
+def _scan_one(path, search_bytes):
+    """Byte offset of the first match in path, or -1 (also for unreadable files)"""
+    try:
+        with open(path, "rb") as f:
+            # Empty files can't be mapped
+            if os.fstat(f.fileno()).st_size == 0:
+                return b"".find(search_bytes)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return data.find(search_bytes)
+    except Exception:
+        return -1  # skip unreadable files
+
+def _scan_many(path, pattern):
+    """(offset, matched bytes) for every match of pattern in path"""
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return [(m.start(), m.group()) for m in pattern.finditer(data)]
+    except Exception:
+        return []  # skip unreadable files
+
+def guid_to_bytes(guid, ascii_mode=False):
     if ascii_mode:
-        search_bytes = guid.encode("ascii")
-    else:
-        # Remove dashes if user passes a dashed GUID
-        guid = guid.replace("-", "")
-        search_bytes = binascii.unhexlify(guid)
-
-    for root, _, files in os.walk(folder):
-        for name in files:
-            path = os.path.join(root, name)
-            try:
-                with open(path, "rb") as f:
-                    data = f.read()
-                    offset = data.find(search_bytes)
-                    if offset != -1:
-                        mode = "ASCII" if ascii_mode else "BYTES"
-                        print(
-                            f"[{mode}] Found in {path} at byte offset {offset} (0x{offset:X})"
-                        )
-            except Exception:
-                pass  # skip unreadable files
+        return guid.encode("ascii")
+    # Remove dashes if user passes a dashed GUID
+    return binascii.unhexlify(guid.replace("-", ""))
+
+def walk_files(folder):
+    return [
+        os.path.join(root, name)
+        for root, _, files in os.walk(folder)
+        for name in files
+    ]
+
+def search_guid(folder, guid, ascii_mode=False):
+    search_bytes = guid_to_bytes(guid, ascii_mode)
+    paths = walk_files(folder)
+
+    # Files are scanned in worker processes, each mapping the file rather than
+    # reading it into memory; map() keeps results in walk order for printing
+    mode = "ASCII" if ascii_mode else "BYTES"
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        offsets = executor.map(_scan_one, paths, [search_bytes] * len(paths), chunksize=32)
+        for path, offset in zip(paths, offsets):
+            if offset != -1:
+                print(
+                    f"[{mode}] Found in {path} at byte offset {offset} (0x{offset:X})"
+                )
+
+def search_guids(folder, guids, ascii_mode=False):
+    """Report every occurrence of any of guids, scanning each file once"""
+    labels = {guid_to_bytes(guid, ascii_mode): guid for guid in guids}
+    # One alternation instead of a find per GUID; longer needles go first so
+    # one that prefixes another can't shadow it
+    needles = sorted(labels, key=len, reverse=True)
+    pattern = re.compile(b"|".join(map(re.escape, needles)))
+    paths = walk_files(folder)
+
+    mode = "ASCII" if ascii_mode else "BYTES"
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = executor.map(_scan_many, paths, [pattern] * len(paths), chunksize=32)
+        for path, matches in zip(paths, results):
+            for offset, needle in matches:
+                print(
+                    f"[{mode}] Found {labels[needle]} in {path} at byte offset {offset} (0x{offset:X})"
+                )
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Search folder for RenderWare GUID")
     parser.add_argument("folder", help="Folder to search")
     parser.add_argument(
         "guid",
+        nargs="?",
         help="GUID (32-char hex for byte search or literal string for --ascii)",
     )
+    parser.add_argument(
+        "--guids",
+        metavar="FILE",
+        help="Search for every GUID listed in FILE (one per line) in a single pass",
+    )
     parser.add_argument(
         "--ascii",
         action="store_true",
@@ -39,4 +94,15 @@ if __name__ == "__main__":
     )
 
     args = parser.parse_args()
-    search_guid(args.folder, args.guid, ascii_mode=args.ascii)
+    if args.guids:
+        with open(args.guids, "r") as f:
+            guids = [line.strip() for line in f if line.strip()]
+        if args.guid is not None:
+            guids.append(args.guid)
+        if not guids:
+            parser.error(f"no GUIDs found in {args.guids}")
+        search_guids(args.folder, guids, ascii_mode=args.ascii)
+    elif args.guid is not None:
+        search_guid(args.folder, args.guid, ascii_mode=args.ascii)
+    else:
+        parser.error("a GUID or --guids FILE is required")
@@ -1,4 +1,7 @@
+import binascii
 import struct
+import sys
+from collections import defaultdict
 from enum import Enum
 import uuid
 
@@ -88,14 +91,59 @@ rwID_UNICODESTRING = MAKECHUNKID(rwVENDORID_CORE, 0x13)
 rwID_ATOMIC = MAKECHUNKID(rwVENDORID_CORE, 0x14)
 rwID_GEOMETRYLIST = MAKECHUNKID(rwVENDORID_CORE, 0x1A)
 
+# Chunks that contain other chunks
+_COMPLEX_CHUNK_IDS = frozenset((
+    rwID_CAMERA,
+    rwID_TEXTURE,
+    rwID_MATERIAL,
+    rwID_MATLIST,
+    rwID_ATOMICSECT,
+    rwID_PLANESECT,
+    rwID_WORLD,
+    rwID_FRAMELIST,
+    rwID_GEOMETRY,
+    rwID_CLUMP,
+    rwID_LIGHT,
+    rwID_ATOMIC,
+    rwID_GEOMETRYLIST,
+))
+
+
+# Single-field Structs compiled once per byte order; Parser.endian picks the set
+_STRUCTS = {
+    endian: {code: struct.Struct(endian + code) for code in "BbHhIiQqfd"}
+    for endian in "<>"
+}
+
+# Fixed records: RenderWare chunk header (type, length, library ID), the
+# (size, command) header in front of each attribute packet, and a 4x4 matrix
+_CHUNK_HDR = struct.Struct("<III")
+_PKT_HDR = struct.Struct("<II")
+_MAT4 = struct.Struct("<16f")
+_U32 = _STRUCTS["<"]["I"]
+
+# Attribute text view: ASCII letters kept, every other byte shown as a space
+_ALPHA_TABLE = bytes(
+    b if (65 <= b <= 90) or (97 <= b <= 122) else 0x20 for b in range(256)
+)
+
 
 class Parser:
     def __init__(self, data: bytes, endian: str = "little"):
-        if not isinstance(data, (bytes, bytearray)):
-            raise TypeError("data must be bytes or bytearray")
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError("data must be bytes, bytearray or memoryview")
 
         self.data = data
+        # read/readBytes hand out slices of this view rather than copies, so
+        # the nested chunk parsers below share the one stream buffer
+        self.view = memoryview(data)
+        # Strings are searched for on the buffer itself; a memoryview has no
+        # find, so a Parser over one searches a bytes copy of it instead
+        self._find = data.find if hasattr(data, "find") else bytes(data).find
         self.offset = 0
+        # Reads are bounded here rather than at len(data), so a nested chunk
+        # can be parsed in place between beginChunk and endChunk
+        self.end = len(data)
 
         if endian == "little":
             self.endian = "<"
@@ -104,33 +152,44 @@ class Parser:
         else:
             raise ValueError("endian must be 'little' or 'big'")
 
+    @property
+    def endian(self) -> str:
+        return self._endian
+
+    @endian.setter
+    def endian(self, endian: str):
+        # Rebinding the Struct set here keeps _read down to one lookup
+        self._structs = _STRUCTS[endian]
+        self._endian = endian
+
     # -------------------------
     # Core helpers
     # -------------------------
 
-    def _read(self, fmt: str):
-        size = struct.calcsize(fmt)
-        if self.offset + size > len(self.data):
+    def _read(self, code: str):
+        st = self._structs[code]
+        end = self.offset + st.size
+        if end > self.end:
             raise EOFError("Attempt to read past end of buffer")
 
-        value = struct.unpack_from(fmt, self.data, self.offset)
-        self.offset += size
-        return value[0] if len(value) == 1 else value
+        value = st.unpack_from(self.data, self.offset)[0]
+        self.offset = end
+        return value
 
-    def read(self, size: int) -> bytes:
+    def read(self, size: int) -> memoryview:
         """
         Equivalent to RwStreamRead(stream, buffer, size)
-        Returns bytes read (may be shorter only at EOF).
+        Returns a view of the bytes read (may be shorter only at EOF).
         """
-        if self.offset + size > len(self.data):
+        if self.offset + size > self.end:
             return b""
 
-        chunk = self.data[self.offset : self.offset + size]
+        chunk = self.view[self.offset : self.offset + size]
         self.offset += size
         return chunk
 
     def seek(self, offset: int):
-        if offset < 0 or offset > len(self.data):
+        if offset < 0 or offset > self.end:
             raise ValueError("Invalid seek offset")
         self.offset = offset
 
@@ -141,68 +200,84 @@ class Parser:
         self.seek(self.offset + size)
 
     def canRead(self, size: int) -> bool:
-        return self.offset + size <= len(self.data)
+        return self.offset + size <= self.end
+
+    def beginChunk(self, size: int) -> int:
+        """
+        Bound reads to the next size bytes, as if they had been taken with
+        readBytes(size) into their own Parser.
+        Returns the outer bound, to hand back to endChunk.
+        """
+        end = self.offset + size
+        if end > self.end:
+            raise EOFError("Attempt to read past end of buffer")
+
+        outer = self.end
+        self.end = end
+        return outer
+
+    def endChunk(self, outer: int):
+        """Restore the bound from beginChunk and move to the end of the chunk."""
+        self.offset = self.end
+        self.end = outer
 
     # -------------------------
     # Integer reads
     # -------------------------
 
     def readUint8(self):
-        return self._read(self.endian + "B")
+        return self._read("B")
 
     def readInt8(self):
-        return self._read(self.endian + "b")
+        return self._read("b")
 
     def readUint16(self):
-        return self._read(self.endian + "H")
+        return self._read("H")
 
     def readInt16(self):
-        return self._read(self.endian + "h")
+        return self._read("h")
 
     def readUint32(self):
-        return self._read(self.endian + "I")
+        return self._read("I")
 
     def readInt32(self):
-        return self._read(self.endian + "i")
+        return self._read("i")
 
     def readUint64(self):
-        return self._read(self.endian + "Q")
+        return self._read("Q")
 
     def readInt64(self):
-        return self._read(self.endian + "q")
+        return self._read("q")
 
     # -------------------------
     # Floating point
     # -------------------------
 
     def readFloat(self):
-        return self._read(self.endian + "f")
+        return self._read("f")
 
     def readDouble(self):
-        return self._read(self.endian + "d")
+        return self._read("d")
 
     # -------------------------
     # Raw / strings
     # -------------------------
 
-    def readBytes(self, size: int) -> bytes:
-        if self.offset + size > len(self.data):
+    def readBytes(self, size: int) -> memoryview:
+        if self.offset + size > self.end:
             raise EOFError("Attempt to read past end of buffer")
 
-        b = self.data[self.offset : self.offset + size]
+        b = self.view[self.offset : self.offset + size]
         self.offset += size
         return b
 
     def readCString(self, encoding="utf-8") -> str:
-        start = self.offset
-        while self.offset < len(self.data) and self.data[self.offset] != 0:
-            self.offset += 1
-
-        if self.offset >= len(self.data):
+        end = self._find(b"\x00", self.offset, self.end)
+        if end < 0:
             raise EOFError("Unterminated C string")
 
-        s = self.data[start : self.offset].decode(encoding)
-        self.offset += 1  # skip null byte
+        s = str(self.view[self.offset : end], encoding)
+        self.offset = end + 1  # skip null byte
         return s
 
     def readPaddedCString(self, alignment=4, encoding="utf-8") -> str:
@@ -215,7 +290,8 @@ class Parser:
         return s
 
     def readGUID(self):
-        guid_bytes = self.readBytes(16)
+        # uuid.UUID only takes real bytes
+        guid_bytes = bytes(self.readBytes(16))
         return uuid.UUID(bytes=guid_bytes)
 
     def readBool(self):
@@ -223,35 +299,9 @@ class Parser:
 
 
 def chunk_is_complex(chunk_header_info) -> bool:
-    t = chunk_header_info.get("type", "")
-
-    if t in (
-        rwID_STRUCT,
-        rwID_STRING,
-        rwID_EXTENSION,
-        rwID_MATRIX,
-        rwID_UNICODESTRING,
-    ):
-        return False
-
-    if t in (
-        rwID_CAMERA,
-        rwID_TEXTURE,
-        rwID_MATERIAL,
-        rwID_MATLIST,
-        rwID_ATOMICSECT,
-        rwID_PLANESECT,
-        rwID_WORLD,
-        rwID_FRAMELIST,
-        rwID_GEOMETRY,
-        rwID_CLUMP,
-        rwID_LIGHT,
-        rwID_ATOMIC,
-        rwID_GEOMETRYLIST,
-    ):
-        return True
-
-    return False
+    # Anything not listed, including the plain struct/string/extension/
+    # matrix chunks, is not complex
+    return chunk_header_info.get("type", "") in _COMPLEX_CHUNK_IDS
 
 
 def rw_library_id_unpack_version(library_id: int) -> int:
@@ -277,26 +327,19 @@ def _rw_stream_read_chunk_header(parser):
         return None
 
     # RwMemNative32 equivalent: assume little-endian
-    mark_type, mark_length, library_id = struct.unpack("<III", raw)
-
-    chunk_hdr_info = {"type": mark_type, "length": mark_length}
+    mark_type, mark_length, library_id = _CHUNK_HDR.unpack(raw)
 
     # Old vs new library ID
     if (library_id & 0xFFFF0000) == 0:
-        chunk_hdr_info["version"] = library_id << 8
-        chunk_hdr_info["buildNum"] = 0
+        version = library_id << 8
+        build_num = 0
     else:
-        chunk_hdr_info["version"] = rw_library_id_unpack_version(library_id)
-        chunk_hdr_info["buildNum"] = rw_library_id_unpack_build_num(library_id)
+        version = rw_library_id_unpack_version(library_id)
+        build_num = rw_library_id_unpack_build_num(library_id)
 
-    chunk_hdr_info["isComplex"] = chunk_is_complex(chunk_hdr_info)
-
-    return (
-        chunk_hdr_info["type"],
-        chunk_hdr_info["length"],
-        chunk_hdr_info["version"],
-        chunk_hdr_info["buildNum"],
-    )
+    # isComplex is left to RwStreamReadChunkHeaderInfo, the only caller
+    # that keeps it
+    return mark_type, mark_length, version, build_num
 
 
 def RwStreamReadChunkHeaderInfo(parser):
@@ -329,13 +372,10 @@ def RwStreamReadChunkHeaderInfo(parser):
 
 class UsageCounter:
     def __init__(self):
-        self.counterDict = {}
+        self.counterDict = defaultdict(int)
 
     def plusOne(self, key):
-        if key in self.counterDict:
-            self.counterDict[key] += 1
-        else:
-            self.counterDict[key] = 1
+        self.counterDict[key] += 1
 
     def get(self):
         return self.counterDict
@@ -347,40 +387,50 @@ class UsageCounter:
 def PrintPlacementNewParams(parser: Parser, chunkHeaderInfo):
     print(f"{hex(parser.offset)} - strFunc_PlacementNew")
 
-    # read entire chunk into a sub-buffer, advancing the stream past it
-    buf = Parser(parser.readBytes(chunkHeaderInfo["length"]), endian="little")
+    # parse the chunk in place, then carry on past it
+    outer = parser.beginChunk(chunkHeaderInfo["length"])
 
-    elementCount = buf.readUint32()
+    elementCount = parser.readUint32()
 
     for element in range(0, elementCount):
-        behaviour = buf.readPaddedCString()
-        entityCount = buf.readUint32()
+        behaviour = parser.readPaddedCString()
+        entityCount = parser.readUint32()
         print(f"    {behaviour} Count:{entityCount}")
 
+    parser.endChunk(outer)
+
 
 def PrintUploadResources(parser: Parser, chunkHeaderInfo):
     print(f"{hex(parser.offset)} - strfunc_LoadEmbeddedAsset")
 
     headerSize = parser.readUint32()
 
-    # read entire chunk into a sub-buffer
-    buf = Parser(parser.readBytes(headerSize), endian="little")
-
+    # dataSize follows the header; read it first, then come back and parse the
+    # header in place
+    headerStart = parser.tell()
+    parser.readBytes(headerSize)
     dataSize = parser.readUint32()
+    dataStart = parser.tell()
+
+    parser.seek(headerStart)
+    outer = parser.beginChunk(headerSize)
 
-    nameLength = buf.readUint32()
-    name = buf.readPaddedCString(nameLength)
+    nameLength = parser.readUint32()
+    name = parser.readPaddedCString(nameLength)
 
-    guid = buf.readGUID()
+    guid = parser.readGUID()
 
-    typeLength = buf.readUint32()
-    assetType = buf.readPaddedCString(typeLength)
+    typeLength = parser.readUint32()
+    assetType = parser.readPaddedCString(typeLength)
 
-    fileLength = buf.readUint32()
-    file = buf.readPaddedCString(fileLength)
+    fileLength = parser.readUint32()
+    file = parser.readPaddedCString(fileLength)
 
-    depsSize = buf.readUint32()
-    dependecies = buf.readPaddedCString(depsSize)
+    depsSize = parser.readUint32()
+    dependecies = parser.readPaddedCString(depsSize)
+
+    parser.endChunk(outer)
+    parser.seek(dataStart)
     
     print(f"\tHeader Size: {headerSize}")
     print(f"\tData Size: {dataSize}")
@@ -407,66 +457,34 @@ def PrintSectionHeader(chunkHeaderInfo):
 
 
 def ParseMatrix4x4(data):
-    buf = Parser(data, endian="little")
-
-    matrix = [
-        [0, 0, 0, 0],
-        [0, 0, 0, 0],
-        [0, 0, 0, 0],
-        [0, 0, 0, 0],
-    ]
-    
-    matrix[0][0] = buf.readFloat()
-    matrix[0][1] = buf.readFloat()
-    matrix[0][2] = buf.readFloat()
-    matrix[0][3] = buf.readFloat()
-    
-    matrix[1][0] = buf.readFloat()
-    matrix[1][1] = buf.readFloat()
-    matrix[1][2] = buf.readFloat()
-    matrix[1][3] = buf.readFloat()
-    
-    matrix[2][0] = buf.readFloat()
-    matrix[2][1] = buf.readFloat()
-    matrix[2][2] = buf.readFloat()
-    matrix[2][3] = buf.readFloat()
-    
-    matrix[3][0] = buf.readFloat()
-    matrix[3][1] = buf.readFloat()
-    matrix[3][2] = buf.readFloat()
-    matrix[3][3] = buf.readFloat()
-    
-    return matrix
+    # All 16 floats in one unpack, row-major
+    if len(data) < _MAT4.size:
+        raise EOFError("Attempt to read past end of buffer")
+
+    values = _MAT4.unpack_from(data, 0)
+    return [list(values[i : i + 4]) for i in range(0, 16, 4)]
 
 
 def HandleAttribute(command, data, strCurrentClass):
+    """Returns the line to print for one attribute packet"""
     if command == 1 and strCurrentClass == "CSystemCommands":
         matrix = ParseMatrix4x4(data)
         with open("entities.txt", "a") as f:
             f.write(str(matrix)+"\n")
-        print(f"\t\t{matrix} Attribute {command:>3}")
-        return
+        return f"\t\t{matrix} Attribute {command:>3}"
 
     output = f"\t\tAttribute {command:>3}"
 
     if data:
-        textChars = data
-
-        # Text view: alpha chars kept, others replaced with space, padded to 15
-        textView = ""
-        for b in textChars:
-            if (65 <= b <= 90) or (97 <= b <= 122):
-                textView += chr(b)
-            else:
-                textView += " "
+        # Text view: alpha chars kept, others replaced with space
+        textView = bytes(data).translate(_ALPHA_TABLE).decode("ascii")
 
         # Hex view: uppercase, 2-digit, space separated
-        hexParts = [f"{b:02X}" for b in textChars]
-        hexView = " ".join(hexParts)
+        hexView = binascii.hexlify(data, " ").decode("ascii").upper()
 
         output += f": [{textView}][{hexView}]"
 
-    print(output)
+    return output
 
 
 def HandleAttributes(data, ussageCounter_behaviour: UsageCounter):
@@ -475,59 +493,84 @@ def HandleAttributes(data, ussageCounter_behaviour: UsageCounter):
     RWSPH_CREATECLASSID = 0x20000000
     strCurrentClass = ""
 
-    buf = Parser(data, endian="little")
-
-    while buf.canRead(4):
-        packetStart = buf.tell()
-        packetSize = buf.readUint32()
-        if packetSize == 0:
-            break
-
-        command = buf.readUint32()
-        dataSize = packetSize - 2 * 4  # subtract the two uint32s (size + command)
-
-        if command == RWSPH_CLASSID:
-            dataBytes = buf.readBytes(dataSize)
-            strCurrentClass = dataBytes.split(b"\x00")[0].decode(
-                "ascii", errors="replace"
-            )
-            print(f"\tClass:\t{strCurrentClass}")
-            
-        elif command == RWSPH_INSTANCEID:
-            entityID = uuid.UUID(bytes=buf.readBytes(16))
-            print(f"\tEntity ID:\t{{{entityID}}}")
+    # Lines are collected and written once per entity rather than printed one
+    # by one; the finally still writes what was parsed if a packet is bad
+    lines = []
+    try:
+        # Walked with a plain cursor: each packet header is one unpack, and
+        # payloads are sliced straight out of data
+        end = len(data)
+        offset = 0
+
+        while offset + 4 <= end:
+            if offset + 8 > end:
+                # Only room for the size; a zero size still ends the list
+                if _U32.unpack_from(data, offset)[0] == 0:
+                    break
+                raise EOFError("Attempt to read past end of buffer")
+
+            packetSize, command = _PKT_HDR.unpack_from(data, offset)
+            if packetSize == 0:
+                break
+
+            payloadStart = offset + 8
+            dataSize = packetSize - 2 * 4  # subtract the two uint32s (size + command)
+
+            # Instance and asset IDs are always a 16-byte GUID, whatever the size says
+            if command == RWSPH_INSTANCEID or (command == 0 and strCurrentClass == "CSystemCommands"):
+                payloadEnd = payloadStart + 16
+            else:
+                payloadEnd = payloadStart + dataSize
+            if payloadEnd > end:
+                raise EOFError("Attempt to read past end of buffer")
+            dataBytes = data[payloadStart:payloadEnd]
+
+            if command == RWSPH_CLASSID:
+                strCurrentClass = bytes(dataBytes).split(b"\x00")[0].decode(
+                    "ascii", errors="replace"
+                )
+                lines.append(f"\tClass:\t{strCurrentClass}")
             
-        elif command == RWSPH_CREATECLASSID:
-            dataBytes = buf.readBytes(dataSize)
+            elif command == RWSPH_INSTANCEID:
+                entityID = uuid.UUID(bytes=bytes(dataBytes))
+                lines.append(f"\tEntity ID:\t{{{entityID}}}")
             
-            behaviour = dataBytes.split(b"\x00")[0].decode("ascii", errors="replace")
-            print(f"\tBehaviour:\t{behaviour}")
-            ussageCounter_behaviour.plusOne(behaviour.strip())
+            elif command == RWSPH_CREATECLASSID:
+                behaviour = bytes(dataBytes).split(b"\x00")[0].decode("ascii", errors="replace")
+                lines.append(f"\tBehaviour:\t{behaviour}")
+                ussageCounter_behaviour.plusOne(behaviour.strip())
             
-        else:
-            if command == 0 and strCurrentClass == "CSystemCommands":
-                assetID = uuid.UUID(bytes=buf.readBytes(16))
-                print(f"\t\tAttach asset, ID:\t{{{assetID}}}")
             else:
-                HandleAttribute(command, buf.readBytes(dataSize), strCurrentClass)
+                if command == 0 and strCurrentClass == "CSystemCommands":
+                    assetID = uuid.UUID(bytes=bytes(dataBytes))
+                    lines.append(f"\t\tAttach asset, ID:\t{{{assetID}}}")
+                else:
+                    lines.append(HandleAttribute(command, dataBytes, strCurrentClass))
 
-        # Advance to next packet (ensures correct alignment regardless of how much data was consumed)
-        buf.seek(packetStart + packetSize)
+            # Advance to next packet (ensures correct alignment regardless of how much data was consumed)
+            offset += packetSize
+            if offset > end:
+                raise ValueError("Invalid seek offset")
 
-    print()
+        lines.append("")
+    finally:
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
 
 
 def PrintCreateEntity(parser: Parser, chunkHeaderInfo, ussageCounter_behaviour):
     print(f"{hex(parser.offset)} - strfunc_CreateEntity")
 
-    buf = Parser(parser.readBytes(chunkHeaderInfo["length"]), endian="little")
+    outer = parser.beginChunk(chunkHeaderInfo["length"])
 
-    isGlobal = buf.readBool()
+    isGlobal = parser.readBool()
 
-    attributePacket = buf.readBytes(
+    attributePacket = parser.readBytes(
         chunkHeaderInfo["length"] - 4
     )  # 4 bytes for the RwBool
 
+    parser.endChunk(outer)
+
     HandleAttributes(attributePacket, ussageCounter_behaviour)
 
     print(f"\tGlobal Flag:\t{isGlobal}")
@@ -7,9 +7,28 @@ import uuid
 
 RW_CONTAINER = 1814
 
+_U32 = struct.Struct("<I")
+_pack_u32 = _U32.pack
+# Section header: rwType, sectSize, rwVersion, written in one pack
+_SECTION_HEADER = struct.Struct("<III")
 
-def write_u32(f, val):
-    f.write(struct.pack("<I", val))
+
+def write_section_header(f, rwType, sectSize, rwVersion):
+    f.write(_SECTION_HEADER.pack(rwType, sectSize, rwVersion))
+
+
+def decode_container(container):
+    """Manifest container fields in header order, with the base64 and GUID
+    strings decoded to bytes"""
+    return (
+        container["nameSize"],
+        base64.b64decode(container["name_raw"]),
+        uuid.UUID(container["guid"]).bytes,
+        container["rwID_Size"],
+        base64.b64decode(container["rwID_raw"]),
+        base64.b64decode(container.get("remaining_header", "")),
+        base64.b64decode(container.get("trailing_data", "")),
+    )
 
 
 def main(in_dir, out_file):
@@ -22,8 +41,16 @@ def main(in_dir, out_file):
     with open(manifest_path, "r") as mf:
         manifest = json.load(mf)
 
+    entries = manifest["entries"]
+    # Decoded before the output is opened, so a bad manifest entry fails
+    # without leaving a half-written stream behind
+    containers = [
+        decode_container(entry["container"]) if entry["is_container"] else None
+        for entry in entries
+    ]
+
     with open(out_file, "wb") as f:
-        for entry in manifest["entries"]:
+        for entry, container in zip(entries, containers):
             filename = entry["filename"]
             filepath = os.path.join(in_dir, filename)
 
@@ -41,49 +68,46 @@ def main(in_dir, out_file):
                 # Non-container: sectSize is just the file data size
                 sectSize = len(file_data)
 
-                write_u32(f, rwType)
-                write_u32(f, sectSize)
-                write_u32(f, rwVersion)
+                write_section_header(f, rwType, sectSize, rwVersion)
                 f.write(file_data)
 
                 print(f"Packed: {filename} (non-container, {sectSize} bytes)")
 
             else:
                 # Container: rebuild the full structure
-                container = entry["container"]
-
-                name_raw = base64.b64decode(container["name_raw"])
-                guid = uuid.UUID(container["guid"]).bytes
-                rwID_raw = base64.b64decode(container["rwID_raw"])
-                remaining_header = base64.b64decode(container.get("remaining_header", ""))
-                trailing_data = base64.b64decode(container.get("trailing_data", ""))
+                (
+                    nameSize, name_raw, guid,
+                    rwID_Size, rwID_raw, remaining_header, trailing_data,
+                ) = container
 
                 # Build container header
                 # Header contains: nameSize(4) + name_raw + guid(16) + rwID_Size(4) + rwID_raw + remaining
-                header_content = b""
-                header_content += struct.pack("<I", container["nameSize"])
-                header_content += name_raw
-                header_content += guid
-                header_content += struct.pack("<I", container["rwID_Size"])
-                header_content += rwID_raw
-                header_content += remaining_header
+                header_content = b"".join((
+                    _pack_u32(nameSize),
+                    name_raw,
+                    guid,
+                    _pack_u32(rwID_Size),
+                    rwID_raw,
+                    remaining_header,
+                ))
 
                 headerSize = len(header_content)
 
                 # Full container data: headerSize(4) + header_content + fSize(4) + file_data + trailing
-                container_data = b""
-                container_data += struct.pack("<I", headerSize)
-                container_data += header_content
-                container_data += struct.pack("<I", len(file_data))
-                container_data += file_data
-                container_data += trailing_data
-
-                sectSize = len(container_data)
-
-                write_u32(f, rwType)
-                write_u32(f, sectSize)
-                write_u32(f, rwVersion)
-                f.write(container_data)
+                # Kept as separate parts and written in order, so file_data is
+                # never copied into one joined buffer
+                container_parts = (
+                    _pack_u32(headerSize),
+                    header_content,
+                    _pack_u32(len(file_data)),
+                    file_data,
+                    trailing_data,
+                )
+
+                sectSize = sum(map(len, container_parts))
+
+                write_section_header(f, rwType, sectSize, rwVersion)
+                f.writelines(container_parts)
 
                 print(f"Packed: {filename} (container, {sectSize} bytes)")
 